@@ -17,6 +17,10 @@ class Settings(BaseSettings):
     # ML Pipeline settings
     ml_target_nodes: int = 150  # Target number of games to fetch for ML
     ml_request_delay_seconds: float = 0.0  # Delay between ML requests (for rate limiting)
+    ml_batch_size: int = 256  # Records per Databricks serving call
+    ml_max_concurrency: int = 8  # Serving calls in flight at once
+    ml_cache_ttl_seconds: float = 10.0  # Reuse full-slate predictions this long (0 disables)
+    prediction_cache_ttl_seconds: float = 30.0  # Reuse scores of identical requests (0 disables)
 
     # ------------------------------------------------------------------
     # Arbitrage Middleware — PRD v3 Volume Optimization (§5)
@@ -73,6 +77,16 @@ class Settings(BaseSettings):
     delta_games_table: str = "workspace.default.upcoming_games"
     delta_odds_table: str = "workspace.default.game_odds"
 
+    # How long fetched games / odds are served from memory (seconds)
+    games_cache_ttl_seconds: float = 300.0
+    # Past the TTL, stale games are still served (and refreshed in the
+    # background) for this much longer before callers block on a refetch
+    games_cache_stale_seconds: float = 600.0
+    odds_cache_ttl_seconds: float = 30.0
+    # Odds for the first N games of a Databricks games fetch are loaded in
+    # the background, ahead of per-game lookups (0 disables)
+    odds_prefetch_count: int = 20
+
     # Local model checkpoint (used when Databricks endpoint is unavailable)
     model_checkpoint_path: str = "models/model.ckpt"
 
@@ -82,6 +96,15 @@ class Settings(BaseSettings):
     #   auto   — try remote, fall back to local on error
     model_execution_mode: str = "local"
 
+    # Intra-op CPU threads for local inference (0 keeps torch's default).
+    # The model is small enough that a couple of threads beat a wide pool.
+    model_intra_threads: int = 2
+
+    # Markets whose best bookmaker pair has a combined implied probability at
+    # or above this can't be arbitraged. They skip the model and are returned
+    # with confidence 0.0 and prediction "no arbitrage".
+    no_arb_skip_threshold: float = 1.0
+
 
     # Data output
     data_output_dir: str = "data/raw"
@@ -1,14 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routers import health, games, arbitrage, nodes, ml
+from app.services import delta_lake_service
+from app.services.http_client import close_shared_client, open_shared_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http = open_shared_client()
+    await delta_lake_service.warm_up()
+    model_warm_up = None
+    if settings.model_execution_mode.lower() != "local":
+        # Imported here so local-mode startup doesn't pull in torch early
+        from app.services import prediction_service
+
+        # Runs in the background; the first prediction picks up the service
+        model_warm_up = asyncio.create_task(prediction_service.warm_up())
+    try:
+        yield
+    finally:
+        if model_warm_up is not None:
+            model_warm_up.cancel()
+        await close_shared_client()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -3,12 +3,12 @@ from pydantic import BaseModel
 
 class MarketPrediction(BaseModel):
     market_type: str       # "spread" | "points_total" | "moneyline"
-    confidence: float      # Raw sigmoid 0-1
+    confidence: float      # Raw sigmoid 0-1; 0.0 when skipped as "no arbitrage"
     bookmaker_1: str
     bookmaker_2: str
     price_1: int           # American odds
     price_2: int           # American odds
-    prediction: str        # e.g. "home -3.5", "over 220.5", "away win"
+    prediction: str        # e.g. "home -3.5", "over 220.5", "away win", "no arbitrage"
 
 
 class GamePredictionResponse(BaseModel):
@@ -1,33 +1,53 @@
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from app.models.game import Game
+from app.services.delta_lake_service import fetch_odds_bytes
 from app.services.games_service import get_all_upcoming_games, get_all_live_games, get_all_games
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
 
+def _http_client(request: Request) -> httpx.AsyncClient | None:
+    """The app's shared client, or None outside the lifespan (e.g. bare TestClient)."""
+    return getattr(request.app.state, "http", None)
+
+
 @router.get("", response_model=list[Game])
-async def upcoming_games():
+async def upcoming_games(request: Request):
     """Return all upcoming scheduled games across NBA, MLB, NFL, and NHL."""
     try:
-        return await get_all_upcoming_games()
+        return await get_all_upcoming_games(_http_client(request))
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
 
 @router.get("/live", response_model=list[Game])
-async def live_games():
+async def live_games(request: Request):
     """Return all currently live (in-progress) games across all leagues."""
     try:
-        return await get_all_live_games()
+        return await get_all_live_games(_http_client(request))
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
 
 @router.get("/all", response_model=list[Game])
-async def all_games():
+async def all_games(request: Request):
     """Return both upcoming and live games (live=0 and live=1) across all leagues."""
     try:
-        return await get_all_games()
+        return await get_all_games(_http_client(request))
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
+@router.get("/{game_id}/odds")
+def game_odds(game_id: str):
+    """Return all odds rows for a single game.
+
+    The body is pre-encoded and memoized by the service, so repeat requests
+    for unchanged odds skip JSON serialization entirely.
+    """
+    try:
+        return Response(content=fetch_odds_bytes(game_id), media_type="application/json")
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
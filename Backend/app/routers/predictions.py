@@ -9,8 +9,8 @@ from app.models.market_prediction import (
 )
 from app.services.prediction_service import predict
 from app.services.game_prediction_service import (
-    get_all_game_predictions,
-    get_single_game_prediction,
+    get_all_game_predictions_async,
+    get_single_game_prediction_async,
 )
 
 router = APIRouter(prefix="/predictions", tags=["Predictions"])
@@ -45,7 +45,7 @@ async def get_all_predictions(
     on all 3 market types, and return predictions.
     """
     try:
-        return get_all_game_predictions(category)
+        return await get_all_game_predictions_async(category)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -57,7 +57,7 @@ async def get_game_prediction(game_id: str) -> GamePredictionResponse:
     on all 3 market types, and return predictions.
     """
     try:
-        result = get_single_game_prediction(game_id)
+        result = await get_single_game_prediction_async(game_id)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -0,0 +1,33 @@
+"""
+JSON codec shared by the services.
+
+orjson encodes and decodes several times faster than the stdlib ``json``
+module; the stdlib is used when it isn't installed. Only relative imports
+are used here, so modules loaded as ``Backend.app.services.*`` by the
+collection scripts can share it too.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Encode *obj* as UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+    def loads(data: bytes | str) -> Any:
+        """Decode a JSON document."""
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Encode *obj* as UTF-8 JSON bytes."""
+        return json.dumps(obj, default=str).encode()
+
+    def loads(data: bytes | str) -> Any:
+        """Decode a JSON document."""
+        return json.loads(data)
@@ -0,0 +1,269 @@
+"""
+Cache-build helpers for the sports-API fallback in delta_lake_service.
+
+Turns upcoming ``Game`` objects into the cached game rows and their
+synthetic odds. Kept free of I/O and module state, with full annotations,
+so it can be compiled ahead of time (e.g. with mypyc) without changing
+any callers.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from app.models.game import Game
+
+logger = logging.getLogger(__name__)
+
+# Constant fields of the six odds rows emitted per game, in output order.
+# Rows are produced by copying these and filling in the per-game values,
+# which is cheaper than building each six-key literal from scratch.
+_ODDS_ROW_TEMPLATES: tuple[dict, ...] = tuple(
+    {"game_id": None, "market_type": market, "bookmaker": book, "price": None,
+     "outcome_side": side, "line_value": None}
+    for market, book, side in (
+        ("moneyline", "DraftKings", "home"),
+        ("moneyline", "FanDuel", "away"),
+        ("spread", "DraftKings", "home"),
+        ("spread", "FanDuel", "away"),
+        ("points_total", "DraftKings", "over"),
+        ("points_total", "ESPNBet", "under"),
+    )
+)
+
+_GAME_ROW_TEMPLATE: dict = dict.fromkeys(
+    ("game_id", "home_team", "away_team", "start_time", "category")
+)
+
+
+@dataclass(slots=True)
+class _GameContext:
+    """Values derived once per selected game and shared by row and odds building."""
+
+    game: Game
+    game_id: str
+    seed: int
+
+
+@lru_cache(maxsize=1024)
+def _slug(name: str) -> str:
+    # Team names recur across games and refreshes
+    return name.replace(" ", "-")
+
+
+def _game_seed(game_id: str) -> int:
+    return hash(game_id) & 0xFFFFFFFFFFFFFFFF
+
+
+def _make_ctx(game: Game, index: int) -> _GameContext:
+    game_id = f"{game.category}-{_slug(game.home_team)}-{_slug(game.away_team)}-{index}"
+    return _GameContext(game, game_id, _game_seed(game_id))
+
+
+def dec_to_am(dec: float) -> int:
+    """Decimal -> American odds, truncated toward zero."""
+    return int((dec - 1) * 100) if dec >= 2.0 else int(-100 / (dec - 1))
+
+
+def generate_varied_odds(game_id: str, seed_offset: int = 0) -> list[dict]:
+    """Generate varied odds for a game to ensure 3D visualization spread.
+
+    Uses game_id hash + offset as seed for reproducibility.
+    Generates odds that create arbitrage opportunities for visualization.
+    """
+    # Use game_id hash for consistent but varied odds per game. A local
+    # generator keeps this reproducible without touching the global RNG.
+    rng = random.Random(hash(game_id) + seed_offset)
+
+    # Generate odds that create arbitrage (implied prob sum < 1.0)
+    # To create arb: (1/dec1) + (1/dec2) < 1.0
+    # Generate varied arbitrage margins from 0.5% to 8%
+    arb_margin_pct = rng.uniform(0.005, 0.08)  # 0.5% to 8%
+    target_sum = 1.0 - arb_margin_pct
+
+    # Split the implied prob between two sides
+    side1_prob = rng.uniform(0.35, 0.65)
+    side2_prob = target_sum - side1_prob
+
+    # Convert to decimal odds then to American
+    dec1 = 1 / side1_prob
+    dec2 = 1 / side2_prob
+
+    price1 = dec_to_am(dec1)
+    price2 = dec_to_am(dec2)
+
+    # Generate spread values
+    spread_value = round(rng.uniform(1.5, 12.5) * 2) / 2
+
+    # Generate spread arb
+    spread_arb = rng.uniform(0.005, 0.08)
+    spread_sum = 1.0 - spread_arb
+    spread_prob1 = rng.uniform(0.40, 0.60)
+    spread_prob2 = spread_sum - spread_prob1
+    spread_price1 = dec_to_am(1 / spread_prob1)
+    spread_price2 = dec_to_am(1 / spread_prob2)
+
+    # Generate total values
+    total_line = round(rng.uniform(180.5, 250.5) * 2) / 2
+    total_arb = rng.uniform(0.005, 0.08)
+    total_sum = 1.0 - total_arb
+    total_prob1 = rng.uniform(0.40, 0.60)
+    total_prob2 = total_sum - total_prob1
+    over_price = dec_to_am(1 / total_prob1)
+    under_price = dec_to_am(1 / total_prob2)
+
+    prices = (price1, price2, spread_price1, spread_price2, over_price, under_price)
+    lines = (None, None, -spread_value, spread_value, total_line, total_line)
+    rows = []
+    for template, price, line in zip(_ODDS_ROW_TEMPLATES, prices, lines):
+        row = template.copy()
+        row["game_id"] = game_id
+        row["price"] = price
+        row["line_value"] = line
+        rows.append(row)
+    return rows
+
+
+def dec_to_am_array(dec: np.ndarray) -> np.ndarray:
+    """Element-wise decimal -> American odds, truncated like ``int()``."""
+    return np.where(dec >= 2.0, (dec - 1) * 100, -100 / (dec - 1)).astype(np.int64)
+
+
+# Uniforms drawn per game: (margin, prob) for each of the three markets,
+# plus the spread value and the total line
+_DRAWS_PER_GAME = 8
+
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_MUL2 = np.uint64(0x94D049BB133111EB)
+
+
+def _seeded_uniforms(seeds: list[int], k: int) -> np.ndarray:
+    """Return an ``(len(seeds), k)`` array of uniforms in [0, 1).
+
+    Row i is SplitMix64 run over ``seeds[i]``, so it depends on that seed
+    alone. This keeps the per-game independence of seeding one generator
+    per game without constructing one per game, which would cost more than
+    the scalar generator the batch replaces.
+    """
+    steps = np.arange(1, k + 1, dtype=np.uint64)
+    x = np.asarray(seeds, dtype=np.uint64)[:, None] + _SPLITMIX_GAMMA * steps
+    x = (x ^ (x >> np.uint64(30))) * _SPLITMIX_MUL1
+    x = (x ^ (x >> np.uint64(27))) * _SPLITMIX_MUL2
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def generate_varied_odds_batch(
+    game_ids: list[str], seeds: list[int] | None = None
+) -> dict[str, list[dict]]:
+    """Generate odds for many games at once, keyed by game_id.
+
+    Same distributions and row layout as :func:`generate_varied_odds`, but
+    each quantity is computed for every game in a single NumPy call. A
+    game's draws come from its own seed only (see :func:`_seeded_uniforms`),
+    so its odds don't depend on which other games share the batch. Callers
+    that already hold the per-game seeds can pass them in.
+    """
+    n = len(game_ids)
+    if n == 0:
+        return {}
+    if seeds is None:
+        seeds = [_game_seed(gid) for gid in game_ids]
+    # Consumed one column (one quantity for every game) at a time
+    draws = iter(_seeded_uniforms(seeds, _DRAWS_PER_GAME).T)
+
+    def _uniform(low: float, high: float) -> np.ndarray:
+        return low + (high - low) * next(draws)
+
+    def _arb_prices(low: float, high: float) -> tuple[list[int], list[int]]:
+        # Two-sided prices whose implied probabilities sum to 1 - margin
+        margin = _uniform(0.005, 0.08)
+        prob1 = _uniform(low, high)
+        prob2 = (1.0 - margin) - prob1
+        return (dec_to_am_array(1 / prob1).tolist(),
+                dec_to_am_array(1 / prob2).tolist())
+
+    ml_home, ml_away = _arb_prices(0.35, 0.65)
+    spread = np.round(_uniform(1.5, 12.5) * 2) / 2
+    spread_home, spread_away = _arb_prices(0.40, 0.60)
+    total_lines = (np.round(_uniform(180.5, 250.5) * 2) / 2).tolist()
+    over, under = _arb_prices(0.40, 0.60)
+
+    # One (price, line) column pair per template row
+    no_line = [None] * n
+    columns = list(zip(
+        _ODDS_ROW_TEMPLATES,
+        (ml_home, ml_away, spread_home, spread_away, over, under),
+        (no_line, no_line, (-spread).tolist(), spread.tolist(), total_lines, total_lines),
+    ))
+
+    odds: dict[str, list[dict]] = {}
+    for i, gid in enumerate(game_ids):
+        rows = []
+        for template, prices, lines in columns:
+            row = template.copy()
+            row["game_id"] = gid
+            row["price"] = prices[i]
+            row["line_value"] = lines[i]
+            rows.append(row)
+        odds[gid] = rows
+    return odds
+
+
+def build_cache(
+    upcoming_games: list[Game], target_games: int
+) -> tuple[list[dict], dict[str, list[dict]]]:
+    """Pick up to *target_games* games, spread evenly across sports, and
+    return ``(game_rows, odds_by_game_id)``."""
+    games: list[dict] = []
+
+    # Organize real games by category
+    games_by_category: dict[str, list[Game]] = {"basketball": [], "baseball": [], "hockey": [], "football": []}
+    for game in upcoming_games:
+        cat = game.category.lower()
+        if cat in games_by_category:
+            games_by_category[cat].append(game)
+
+    # Just use all available games, distributed evenly
+    # Take up to target_games total, prioritizing even distribution
+    games_per_sport = target_games // 4  # Try to get 37-38 per sport
+
+    # First pass: try to get games_per_sport from each sport
+    selected: list[Game] = []
+    for sport_category in ["basketball", "baseball", "hockey", "football"]:
+        selected.extend(games_by_category[sport_category][:games_per_sport])
+
+    # Second pass: if we're under target, fill from sports with extra games
+    remaining_needed = target_games - len(selected)
+    if remaining_needed > 0:
+        logger.info("Need %d more games to reach target - filling from available sports", remaining_needed)
+        for sport_category in ["basketball", "hockey", "baseball", "football"]:
+            if remaining_needed <= 0:
+                break
+
+            extra = games_by_category[sport_category][games_per_sport:games_per_sport + remaining_needed]
+            selected.extend(extra)
+            remaining_needed -= len(extra)
+
+    # Derive each game's id and seed once, then build rows and odds from them
+    contexts = [_make_ctx(game, game_index) for game_index, game in enumerate(selected)]
+    for ctx in contexts:
+        game = ctx.game
+        row = _GAME_ROW_TEMPLATE.copy()
+        row["game_id"] = ctx.game_id
+        row["home_team"] = game.home_team
+        row["away_team"] = game.away_team
+        row["start_time"] = game.start_time
+        row["category"] = game.category
+        games.append(row)
+
+    odds = generate_varied_odds_batch(
+        [ctx.game_id for ctx in contexts], [ctx.seed for ctx in contexts]
+    )
+    return games, odds
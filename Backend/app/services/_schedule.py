@@ -0,0 +1,25 @@
+"""
+Date-window helpers shared by the league schedule services.
+"""
+
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+
+_EPOCH = date(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+
+
+def utc_date_window(fmt: str, days_ahead: int) -> tuple[str, str]:
+    """Return today's UTC date and the date *days_ahead* later, formatted with *fmt*.
+
+    The result only changes at UTC midnight, so it is memoized per UTC day
+    rather than rebuilt from ``datetime.now()`` on every fetch.
+    """
+    return _date_window(int(time.time() // _SECONDS_PER_DAY), fmt, days_ahead)
+
+
+@lru_cache(maxsize=16)
+def _date_window(day: int, fmt: str, days_ahead: int) -> tuple[str, str]:
+    today = _EPOCH + timedelta(days=day)
+    return today.strftime(fmt), (today + timedelta(days=days_ahead)).strftime(fmt)
@@ -12,6 +12,7 @@ Volume algorithm (PRD v3 §3):
 """
 
 import logging
+from functools import lru_cache
 
 from app.config import settings
 from app.models.arbitrage import (
@@ -27,7 +28,10 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # Odds conversion helpers
 # ---------------------------------------------------------------------------
+# Pure, and American prices come from a small, heavily repeated set
+# (-110, -115, +100, ...), so results are memoized.
 
+@lru_cache(maxsize=1024)
 def implied_prob(american_odds: int) -> float:
     """Convert American odds to implied probability."""
     if american_odds > 0:
@@ -35,6 +39,7 @@ def implied_prob(american_odds: int) -> float:
     return abs(american_odds) / (abs(american_odds) + 100)
 
 
+@lru_cache(maxsize=1024)
 def to_decimal(american_odds: int) -> float:
     """Convert American odds to decimal odds."""
     if american_odds > 0:
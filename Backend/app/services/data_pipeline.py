@@ -1,20 +1,24 @@
 """
 Data collection pipeline: fetches events, markets, and odds from the
-Sportsbook API and writes Parquet files partitioned by sport/season.
+Sportsbook API and appends Parquet files to datasets partitioned by
+sport/season.
 """
 
 from __future__ import annotations
 from Backend.app.services.sportsbook_client import SportsbookAPIClient
 from Backend.app.config import settings
 import asyncio
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
-import json
 import logging
+from operator import attrgetter
 from pathlib import Path
 
+import httpx
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from ._json import dumps as _dumps, loads as _loads
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,75 @@ logger = logging.getLogger(__name__)
 _TARGET_MARKET_TYPES = {"MONEYLINE", "POINT_SPREAD", "POINT_TOTAL"}
 _TARGET_SEGMENT = "FULL_MATCH"
 
+# Emit the per-event progress line only every N events
+_PROGRESS_EVERY = 10
+
+# Write buffered rows (and then checkpoint their events) every N events, so
+# a hard crash loses at most this many events' work
+_FLUSH_EVERY = 50
+
+
+# ------------------------------------------------------------------
+# Flattened row types
+# ------------------------------------------------------------------
+# Slotted rows are much smaller than dicts, and market/outcome rows hold a
+# reference to their parent row instead of copying its fields. Columns are
+# only materialised when a batch is written to Parquet.
+
+
+@dataclass(slots=True)
+class EventRow:
+    event_key: str
+    event_name: str
+    event_start_time: str
+    home_participant_key: str
+    away_participant_key: str
+    home_participant_name: str
+    away_participant_name: str
+    competition_instance_name: str
+    competition_instance_start: str
+    competition_instance_end: str
+
+
+@dataclass(slots=True)
+class MarketRow:
+    event: EventRow
+    market_key: str
+    market_type: str
+    market_segment: str
+    market_participant_key: str
+
+
+@dataclass(slots=True)
+class OutcomeRow:
+    market: MarketRow
+    outcome_key: str
+    modifier: str
+    payout: float | None
+    outcome_type: str
+    live: bool | None
+    read_at: str
+    last_found_at: str
+    source: str
+    participant_key: str
+
+
+def _column_getters(row_type: type, prefix: str = "") -> dict[str, attrgetter]:
+    """Map each output column of *row_type* to a getter, following parents."""
+    getters: dict[str, attrgetter] = {}
+    for f in fields(row_type):
+        if f.name == "event":
+            getters.update(_column_getters(EventRow, f"{prefix}event."))
+        elif f.name == "market":
+            getters.update(_column_getters(MarketRow, f"{prefix}market."))
+        else:
+            getters[f.name] = attrgetter(prefix + f.name)
+    return getters
+
+
+_EVENT_COLUMNS = _column_getters(EventRow)
+_OUTCOME_COLUMNS = _column_getters(OutcomeRow)
+
 # Season lookup (sport -> season label for the current collection window)
 SEASON_MAP: dict[str, str] = {
     "NBA": "2024-25",
@@ -46,106 +119,163 @@ class DataCollectionPipeline:
     # Checkpoint helpers
     # ------------------------------------------------------------------
 
+    # The checkpoint is a JSON snapshot plus an append-only log of event keys
+    # completed since the snapshot. Events are appended to the log only once
+    # their rows are on disk, instead of re-serialising the whole set; the
+    # log is folded back into the snapshot once per run.
+
     def _checkpoint_path(self, competition: str, season: str) -> Path:
         path = self._output_dir / f".checkpoint_{competition}_{season}.json"
         path.parent.mkdir(parents=True, exist_ok=True)
         return path
 
+    def _checkpoint_log_path(self, competition: str, season: str) -> Path:
+        return self._checkpoint_path(competition, season).with_suffix(".log")
+
     def _load_checkpoint(self, competition: str, season: str) -> set[str]:
+        completed: set[str] = set()
         cp = self._checkpoint_path(competition, season)
         if cp.exists():
-            return set(json.loads(cp.read_text()))
-        return set()
+            completed.update(_loads(cp.read_bytes()))
+        log = self._checkpoint_log_path(competition, season)
+        if log.exists():
+            with log.open(encoding="utf-8") as f:
+                completed.update(line for line in f.read().splitlines() if line)
+        return completed
+
+    def _append_checkpoint(
+        self, competition: str, season: str, event_keys: list[str]
+    ) -> None:
+        log = self._checkpoint_log_path(competition, season)
+        with log.open("a", encoding="utf-8") as f:
+            f.write("".join(key + "\n" for key in event_keys))
 
     def _save_checkpoint(
         self, competition: str, season: str, completed: set[str]
     ) -> None:
+        """Write a full snapshot of *completed* and drop the append log."""
         cp = self._checkpoint_path(competition, season)
-        cp.write_text(json.dumps(sorted(completed)))
+        cp.write_bytes(_dumps(sorted(completed)))
+        self._checkpoint_log_path(competition, season).unlink(missing_ok=True)
 
     # ------------------------------------------------------------------
     # Parquet writing
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _write_parquet(rows: list[dict], path: Path) -> None:
+    def _write_parquet(
+        rows: list[EventRow] | list[OutcomeRow],
+        columns: dict[str, attrgetter],
+        base_dir: Path,
+        name: str,
+        competition: str,
+        season: str,
+        file_id: str,
+    ) -> None:
+        """Write *rows* as one file in the hive-partitioned dataset under *base_dir*.
+
+        *file_id* is unique per run and flush, so resumed runs add to the
+        ``sport=/season=`` partition instead of overwriting it. The
+        ``sport``/``season`` columns live in the partition path, as with
+        ``pyarrow.dataset`` writes, and are restored on read.
+        """
         if not rows:
-            logger.info("No rows to write for %s", path)
+            logger.info("No %s rows to write for %s %s",
+                        name, competition, season)
             return
+        table = pa.table(
+            {name: list(map(get, rows)) for name, get in columns.items()})
+        path = (base_dir / f"sport={competition}" / f"season={season}"
+                / f"{name}-{file_id}.parquet")
         path.parent.mkdir(parents=True, exist_ok=True)
-        table = pa.Table.from_pylist(rows)
-        pq.write_table(table, str(path))
-        logger.info("Wrote %d rows to %s", len(rows), path)
+        pq.write_table(table, path)
+        logger.info("Wrote %d rows to %s", table.num_rows, path)
 
     # ------------------------------------------------------------------
-    # Row builders — flatten API responses into flat dicts
+    # Row builders — flatten API responses into row objects
     # ------------------------------------------------------------------
 
+    # The API mixes camelCase and snake_case keys. Fallback keys are only looked
+    # up when the primary key is absent, so each field costs a single dict probe
+    # in the common case (a nested ``.get(a, d.get(b))`` always pays for both).
+
     @staticmethod
-    def _flatten_event(event: dict) -> dict:
-        participants = event.get("participants", [])
-        home_participant_key = event.get(
-            "homeParticipantKey", event.get("home_participant_key", ""))
+    def _flatten_event(event: dict) -> EventRow:
+        home_participant_key = (
+            event["homeParticipantKey"] if "homeParticipantKey" in event
+            else event.get("home_participant_key", ""))
         home_key = ""
         away_key = ""
         home_name = ""
         away_name = ""
-        for p in participants:
-            if p.get("key", "") == home_participant_key:
-                home_key = p.get("key", "")
+        for p in event.get("participants", ()):
+            key = p.get("key", "")
+            if key == home_participant_key:
+                home_key = key
                 home_name = p.get("name", "")
             else:
-                away_key = p.get("key", "")
+                away_key = key
                 away_name = p.get("name", "")
 
-        ci = event.get("competitionInstance", event.get(
-            "competition_instance", {})) or {}
-        return {
-            "event_key": event.get("key", ""),
-            "event_name": event.get("name", ""),
-            "event_start_time": event.get("startTime", event.get("start_time", "")),
-            "home_participant_key": home_key,
-            "away_participant_key": away_key,
-            "home_participant_name": home_name,
-            "away_participant_name": away_name,
-            "competition_instance_name": ci.get("name", ""),
-            "competition_instance_start": ci.get("startDate", ci.get("start_date", "")),
-            "competition_instance_end": ci.get("endDate", ci.get("end_date", "")),
-        }
+        ci = (event["competitionInstance"] if "competitionInstance" in event
+              else event.get("competition_instance", {})) or {}
+        return EventRow(
+            event_key=event.get("key", ""),
+            event_name=event.get("name", ""),
+            event_start_time=(event["startTime"] if "startTime" in event
+                              else event.get("start_time", "")),
+            home_participant_key=home_key,
+            away_participant_key=away_key,
+            home_participant_name=home_name,
+            away_participant_name=away_name,
+            competition_instance_name=ci.get("name", ""),
+            competition_instance_start=(ci["startDate"] if "startDate" in ci
+                                        else ci.get("start_date", "")),
+            competition_instance_end=(ci["endDate"] if "endDate" in ci
+                                      else ci.get("end_date", "")),
+        )
 
     @staticmethod
-    def _flatten_market(market: dict, event_flat: dict) -> dict:
-        return {
-            **event_flat,
-            "market_key": market.get("key", ""),
-            "market_type": market.get("type", market.get("marketType", "")),
-            "market_segment": market.get("segment", market.get("marketSegment", "")),
-            "market_participant_key": market.get("participantKey", market.get("participant_key", "")),
-        }
+    def _flatten_market(market: dict, event_row: EventRow) -> MarketRow:
+        get = market.get
+        return MarketRow(
+            event=event_row,
+            market_key=get("key", ""),
+            market_type=(market["type"] if "type" in market
+                         else get("marketType", "")),
+            market_segment=(market["segment"] if "segment" in market
+                            else get("marketSegment", "")),
+            market_participant_key=(
+                market["participantKey"] if "participantKey" in market
+                else get("participant_key", "")),
+        )
 
     @staticmethod
-    def _flatten_outcome(outcome: dict, market_flat: dict) -> dict:
-        # Opening/closing endpoints nest participant info in a dict
-        participant = outcome.get("participant") or {}
-        participant_key = (
-            outcome.get("participantKey")
-            or outcome.get("participant_key")
-            or participant.get("key", "")
-        )
+    def _flatten_outcome(outcome: dict, market_row: MarketRow) -> OutcomeRow:
+        get = outcome.get
+        participant_key = get("participantKey") or get("participant_key")
+        if not participant_key:
+            # Opening/closing endpoints nest participant info in a dict
+            participant_key = (get("participant") or {}).get("key", "")
         # Opening/closing endpoints use "time" instead of readAt/lastFoundAt
-        time_field = outcome.get("time", "")
-        return {
-            **market_flat,
-            "outcome_key": outcome.get("key", outcome.get("outcomeKey", "")),
-            "modifier": outcome.get("modifier", ""),
-            "payout": outcome.get("payout", None),
-            "outcome_type": outcome.get("type", outcome.get("outcomeType", "")),
-            "live": outcome.get("live", outcome.get("isLive", None)),
-            "read_at": outcome.get("readAt", outcome.get("read_at", "")) or time_field,
-            "last_found_at": outcome.get("lastFoundAt", outcome.get("last_found_at", "")) or time_field,
-            "source": outcome.get("source", ""),
-            "participant_key": participant_key,
-        }
+        time_field = get("time", "")
+        return OutcomeRow(
+            market=market_row,
+            outcome_key=(outcome["key"] if "key" in outcome
+                         else get("outcomeKey", "")),
+            modifier=get("modifier", ""),
+            payout=get("payout"),
+            outcome_type=(outcome["type"] if "type" in outcome
+                          else get("outcomeType", "")),
+            live=outcome["live"] if "live" in outcome else get("isLive"),
+            read_at=(outcome["readAt"] if "readAt" in outcome
+                     else get("read_at", "")) or time_field,
+            last_found_at=(
+                outcome["lastFoundAt"] if "lastFoundAt" in outcome
+                else get("last_found_at", "")) or time_field,
+            source=get("source", ""),
+            participant_key=participant_key,
+        )
 
     # ------------------------------------------------------------------
     # Market filtering
@@ -153,8 +283,10 @@ class DataCollectionPipeline:
 
     @staticmethod
     def _is_target_market(market: dict) -> bool:
-        m_type = market.get("type", market.get("marketType", ""))
-        m_seg = market.get("segment", market.get("marketSegment", ""))
+        m_type = (market["type"] if "type" in market
+                  else market.get("marketType", ""))
+        m_seg = (market["segment"] if "segment" in market
+                 else market.get("marketSegment", ""))
         return m_type in _TARGET_MARKET_TYPES and m_seg == _TARGET_SEGMENT
 
     # ------------------------------------------------------------------
@@ -223,34 +355,27 @@ class DataCollectionPipeline:
 
     def _flush_parquet(
         self,
+        file_id: str,
         competition: str,
         season: str,
-        event_rows: list[dict],
-        outcome_rows: list[dict],
-        opening_rows: list[dict],
-        closing_rows: list[dict],
+        event_rows: list[EventRow],
+        outcome_rows: list[OutcomeRow],
+        opening_rows: list[OutcomeRow],
+        closing_rows: list[OutcomeRow],
     ) -> None:
         base = self._output_dir
-        self._write_parquet(
-            event_rows,
-            base /
-            f"events/sport={competition}/season={season}/events.parquet",
-        )
-        self._write_parquet(
-            outcome_rows,
-            base /
-            f"outcomes/sport={competition}/season={season}/outcomes.parquet",
-        )
-        self._write_parquet(
-            opening_rows,
-            base /
-            f"opening_odds/sport={competition}/season={season}/opening.parquet",
-        )
-        self._write_parquet(
-            closing_rows,
-            base /
-            f"closing_odds/sport={competition}/season={season}/closing.parquet",
-        )
+        self._write_parquet(event_rows, _EVENT_COLUMNS,
+                            base / "events", "events", competition, season,
+                            file_id)
+        self._write_parquet(outcome_rows, _OUTCOME_COLUMNS,
+                            base / "outcomes", "outcomes", competition, season,
+                            file_id)
+        self._write_parquet(opening_rows, _OUTCOME_COLUMNS,
+                            base / "opening_odds", "opening", competition, season,
+                            file_id)
+        self._write_parquet(closing_rows, _OUTCOME_COLUMNS,
+                            base / "closing_odds", "closing", competition, season,
+                            file_id)
 
     # ------------------------------------------------------------------
     # Main collection
@@ -281,15 +406,51 @@ class DataCollectionPipeline:
             len(completed_events),
         )
 
-        # 1. Fetch events
-        events = await self._client.get_events(competition, start_date, end_date)
-        logger.info("Fetched %d events for %s", len(events), competition)
+        # 1. Fetch events, with markets embedded when the API supports it
+        try:
+            events = await self._client.get_events_with_markets(
+                competition, start_date, end_date,
+                market_types=tuple(sorted(_TARGET_MARKET_TYPES)),
+                segment=_TARGET_SEGMENT,
+            )
+        except httpx.HTTPStatusError as exc:
+            logger.warning(
+                "Bulk events+markets request failed (%s); falling back to "
+                "per-event market fetches", exc.response.status_code)
+            events = await self._client.get_events(
+                competition, start_date, end_date)
+        n_events = len(events)
+        logger.info("Fetched %d events for %s", n_events, competition)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
         # Accumulators
-        event_rows: list[dict] = []
-        outcome_rows: list[dict] = []
-        opening_rows: list[dict] = []
-        closing_rows: list[dict] = []
+        event_rows: list[EventRow] = []
+        outcome_rows: list[OutcomeRow] = []
+        opening_rows: list[OutcomeRow] = []
+        closing_rows: list[OutcomeRow] = []
+
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        part = 0
+        # Completed events whose rows haven't been written yet
+        pending_keys: list[str] = []
+        totals = dict.fromkeys(("events", "outcomes", "opening", "closing"), 0)
+
+        def flush() -> None:
+            """Write the buffered rows, then checkpoint the events they cover."""
+            nonlocal part
+            self._flush_parquet(
+                f"{run_id}-{part}", competition, season,
+                event_rows, outcome_rows, opening_rows, closing_rows,
+            )
+            part += 1
+            for key, rows in zip(
+                totals, (event_rows, outcome_rows, opening_rows, closing_rows)
+            ):
+                totals[key] += len(rows)
+                rows.clear()
+            if pending_keys:
+                self._append_checkpoint(competition, season, pending_keys)
+                pending_keys.clear()
 
         interrupted = False
         try:
@@ -298,38 +459,41 @@ class DataCollectionPipeline:
                 if not event_key:
                     continue
 
-                event_flat = self._flatten_event(event)
-                event_rows.append(event_flat)
-
+                # Completed events were already written by an earlier run
                 if event_key in completed_events:
-                    logger.debug(
-                        "Skipping already-completed event %s", event_key)
+                    if debug_enabled:
+                        logger.debug(
+                            "Skipping already-completed event %s", event_key)
                     continue
 
-                logger.info(
-                    "[%s] Event %d/%d: %s (%s)",
-                    competition,
-                    i,
-                    len(events),
-                    event_flat["event_name"],
-                    event_key,
-                )
-
-                # 2. Fetch markets for this event
-                try:
-                    markets = await self._client.get_event_markets(event_key)
-                except Exception:
-                    logger.exception(
-                        "Failed to fetch markets for event %s", event_key)
-                    continue
+                event_row = self._flatten_event(event)
+                event_rows.append(event_row)
+
+                # Progress line every _PROGRESS_EVERY events instead of per event
+                if i % _PROGRESS_EVERY == 0 or i == n_events:
+                    logger.info(
+                        "[%s] Event %d/%d: %s (%s)",
+                        competition,
+                        i,
+                        n_events,
+                        event_row.event_name,
+                        event_key,
+                    )
+
+                # 2. Markets come embedded in the event; fetch them only if
+                # the bulk request didn't expand this event
+                markets = event.get("markets")
+                if markets is None:
+                    try:
+                        markets = await self._client.get_event_markets(event_key)
+                    except Exception:
+                        logger.exception(
+                            "Failed to fetch markets for event %s", event_key)
+                        continue
 
                 target_markets = [
                     m for m in markets if self._is_target_market(m)]
-                logger.info(
-                    "  %d markets total, %d target markets",
-                    len(markets),
-                    len(target_markets),
-                )
+                n_opening = n_closing = n_outcomes = 0
 
                 for j, market in enumerate(target_markets, 1):
 
@@ -337,21 +501,23 @@ class DataCollectionPipeline:
                     if not market_key:
                         continue
 
-                    market_flat = self._flatten_market(market, event_flat)
-                    logger.debug(
-                        "  Market %d/%d: %s (%s)",
-                        j,
-                        len(target_markets),
-                        market_flat["market_type"],
-                        market_key,
-                    )
+                    market_row = self._flatten_market(market, event_row)
+                    if debug_enabled:
+                        logger.debug(
+                            "  Market %d/%d: %s (%s)",
+                            j,
+                            len(target_markets),
+                            market_row.market_type,
+                            market_key,
+                        )
                     # 3a. Opening odds
                     opening: list[dict] = []
                     try:
                         opening = await self._client.get_opening_odds(market_key)
                         for o in opening:
                             opening_rows.append(
-                                self._flatten_outcome(o, market_flat))
+                                self._flatten_outcome(o, market_row))
+                        n_opening += len(opening)
                     except Exception:
                         logger.exception(
                             "Failed to fetch opening odds for market %s", market_key
@@ -363,7 +529,8 @@ class DataCollectionPipeline:
                         closing = await self._client.get_closing_odds(market_key)
                         for o in closing:
                             closing_rows.append(
-                                self._flatten_outcome(o, market_flat))
+                                self._flatten_outcome(o, market_row))
+                        n_closing += len(closing)
                     except Exception:
                         logger.exception(
                             "Failed to fetch closing odds for market %s", market_key
@@ -397,15 +564,31 @@ class DataCollectionPipeline:
 
                         for o in outcomes:
                             outcome_rows.append(
-                                self._flatten_outcome(o, market_flat))
+                                self._flatten_outcome(o, market_row))
+                        n_outcomes += len(outcomes)
                     except Exception:
                         logger.exception(
                             "Failed to fetch outcomes for market %s", market_key
                         )
 
-                # Mark event as done
+                # Per-event detail; the INFO progress line above is throttled
+                if debug_enabled:
+                    logger.debug(
+                        "  %s: %d markets (%d target), %d opening, %d closing, "
+                        "%d outcomes",
+                        event_key,
+                        len(markets),
+                        len(target_markets),
+                        n_opening,
+                        n_closing,
+                        n_outcomes,
+                    )
+
+                # Mark event as done; it is checkpointed once flushed
                 completed_events.add(event_key)
-                self._save_checkpoint(competition, season, completed_events)
+                pending_keys.append(event_key)
+                if len(pending_keys) >= _FLUSH_EVERY:
+                    flush()
 
         except (KeyboardInterrupt, asyncio.CancelledError):
             interrupted = True
@@ -418,11 +601,9 @@ class DataCollectionPipeline:
                 len(closing_rows),
             )
         finally:
-            # Write Parquet files on both normal exit and interrupt
-            self._flush_parquet(
-                competition, season,
-                event_rows, outcome_rows, opening_rows, closing_rows,
-            )
+            # Write the remaining rows on both normal exit and interrupt
+            flush()
+            self._save_checkpoint(competition, season, completed_events)
 
         if interrupted:
             logger.info(
@@ -434,8 +615,8 @@ class DataCollectionPipeline:
             "%d opening, %d closing",
             competition,
             season,
-            len(event_rows),
-            len(outcome_rows),
-            len(opening_rows),
-            len(closing_rows),
+            totals["events"],
+            totals["outcomes"],
+            totals["opening"],
+            totals["closing"],
         )
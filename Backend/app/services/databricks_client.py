@@ -7,10 +7,12 @@ Authenticates via OAuth M2M (service principal) and queries the
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.config import Config
+from databricks.sdk.service.sql import StatementParameterListItem
 
 logger = logging.getLogger(__name__)
 
@@ -51,19 +53,33 @@ class DatabricksServingClient:
         )
         return response.as_dict()
 
-    def execute_sql(self, sql: str, warehouse_id: str) -> list[dict]:
+    def execute_sql(
+        self,
+        sql: str,
+        warehouse_id: str,
+        params: dict[str, str] | None = None,
+    ) -> list[dict]:
         """Execute a SQL statement against a Databricks SQL warehouse.
 
         Args:
-            sql: The SQL query to execute.
+            sql: The SQL query to execute. Values are referenced with named
+                markers (``:name``) rather than interpolated.
             warehouse_id: The SQL warehouse ID to run against.
+            params: Values for the named markers in *sql*.
 
         Returns:
             A list of row dicts from the result set.
         """
+        parameters = None
+        if params:
+            parameters = [
+                StatementParameterListItem(name=name, value=value)
+                for name, value in params.items()
+            ]
         response = self._ws.statement_execution.execute_statement(
             statement=sql,
             warehouse_id=warehouse_id,
+            parameters=parameters,
         )
         manifest = response.manifest
         data = response.result
@@ -77,6 +93,19 @@ class DatabricksServingClient:
             for row in data.data_array
         ]
 
+    async def execute_sql_async(
+        self,
+        sql: str,
+        warehouse_id: str,
+        params: dict[str, str] | None = None,
+    ) -> list[dict]:
+        """Run :meth:`execute_sql` in a worker thread.
+
+        The SDK call blocks for the whole statement round-trip; running it
+        off the event loop lets several statements be in flight at once.
+        """
+        return await asyncio.to_thread(self.execute_sql, sql, warehouse_id, params)
+
     def query_split(
         self,
         columns: list[str],
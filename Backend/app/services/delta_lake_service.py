@@ -8,22 +8,53 @@ Falls back to fetching from sports APIs when Databricks is unavailable or not co
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import http.client
 import logging
 import random
-from typing import Optional
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Coroutine, Mapping, NamedTuple, Optional, TypeVar
+
+import requests
 
 from app.config import settings
+from app.services._json import dumps
+from app.services._odds_build import build_cache
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "SAMPLE_GAMES",
+    "SAMPLE_ODDS",
+    "fetch_odds_bytes",
+    "fetch_odds_for_game",
+    "fetch_odds_for_game_async",
+    "fetch_odds_for_games",
+    "fetch_odds_for_games_async",
+    "fetch_upcoming_games",
+    "fetch_upcoming_games_async",
+    "invalidate",
+    "prefetch_stats",
+    "warm_up",
+]
+
+T = TypeVar("T")
+
+
+# Settings are read once at startup, so this can't change at runtime
+_DATABRICKS_ENABLED = bool(
+    settings.databricks_client_id
+    and settings.databricks_client_secret
+    and settings.databricks_warehouse_id
+)
+
 
 def _databricks_available() -> bool:
     """Return True only if Databricks credentials AND warehouse ID are configured."""
-    return bool(
-        settings.databricks_client_id
-        and settings.databricks_client_secret
-        and settings.databricks_warehouse_id
-    )
+    return _DATABRICKS_ENABLED
 
 
 def _get_client():
@@ -32,20 +63,101 @@ def _get_client():
 
     global _client
     if _client is None:
-        _client = DatabricksServingClient(
-            host=settings.databricks_host,
-            client_id=settings.databricks_client_id,
-            client_secret=settings.databricks_client_secret,
-        )
+        with _client_lock:
+            if _client is None:
+                _client = DatabricksServingClient(
+                    host=settings.databricks_host,
+                    client_id=settings.databricks_client_id,
+                    client_secret=settings.databricks_client_secret,
+                )
     return _client
 
 
-
 _client = None
+_client_lock = threading.Lock()
+
+# Network-level failures worth retrying; SQL and auth errors are not
+_TRANSIENT_SQL_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    http.client.IncompleteRead,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+_SQL_ATTEMPTS = 3
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full-jitter backoff: up to 0.25s, 0.5s, 1s, ..."""
+    return random.uniform(0, 0.25 * 2 ** attempt)
+
+
+def _execute_with_retry(sql: str, params: dict[str, str] | None = None) -> list[dict]:
+    """Run *sql* on the warehouse, retrying transient network errors."""
+    for attempt in range(_SQL_ATTEMPTS - 1):
+        try:
+            return _get_client().execute_sql(sql, settings.databricks_warehouse_id, params)
+        except _TRANSIENT_SQL_ERRORS as exc:
+            delay = _retry_delay(attempt)
+            logger.warning("Transient SQL error (%s), retrying in %.2fs", exc, delay)
+            time.sleep(delay)
+    return _get_client().execute_sql(sql, settings.databricks_warehouse_id, params)
+
+
+async def _execute_with_retry_async(sql: str, params: dict[str, str] | None = None) -> list[dict]:
+    """Async :func:`_execute_with_retry`; backs off without blocking the loop."""
+    for attempt in range(_SQL_ATTEMPTS - 1):
+        try:
+            return await _get_client().execute_sql_async(
+                sql, settings.databricks_warehouse_id, params
+            )
+        except _TRANSIENT_SQL_ERRORS as exc:
+            delay = _retry_delay(attempt)
+            logger.warning("Transient SQL error (%s), retrying in %.2fs", exc, delay)
+            await asyncio.sleep(delay)
+    return await _get_client().execute_sql_async(
+        sql, settings.databricks_warehouse_id, params
+    )
+
+# Max game_ids bound into a single IN (...) query
+_SQL_BATCH_SIZE = 500
+# Max chunked odds queries in flight against the warehouse at once
+_SQL_MAX_CONCURRENCY = 8
+
+
+def _in_clause(values: list[str], prefix: str = "id") -> tuple[str, dict[str, str]]:
+    """Return ``(":id0, :id1, ...", {"id0": ..., "id1": ...})`` for *values*."""
+    params = {f"{prefix}{i}": v for i, v in enumerate(values)}
+    return ", ".join(f":{name}" for name in params), params
+
+
+def _normalize_odds_rows(rows: list[dict]) -> list[dict]:
+    """Normalize warehouse odds rows in place and return them.
+
+    ``market_type`` is lowercased and interned once here, so downstream
+    grouping can use it as a dict key directly. ``line_value`` arrives as
+    a string and becomes a float (or None), matching the fallback rows.
+    """
+    for row in rows:
+        market_type = row.get("market_type")
+        if market_type is not None:
+            row["market_type"] = sys.intern(market_type.lower())
+        line_value = row.get("line_value")
+        if line_value is not None:
+            row["line_value"] = float(line_value)
+    return rows
 
 # ── Sample / fallback data ───────────────────────────────────────────
+# Read-only module constants; callers get plain dict copies of them (see
+# _sample_games / _sample_odds) so nothing downstream sees a mappingproxy.
+
+
+def _frozen_rows(rows: list[dict]) -> tuple[Mapping[str, Any], ...]:
+    return tuple(MappingProxyType(row) for row in rows)
+
 
-SAMPLE_GAMES = [
+SAMPLE_GAMES = _frozen_rows([
     {
         "game_id": "sample-001",
         "home_team": "Los Angeles Lakers",
@@ -60,35 +172,154 @@ SAMPLE_GAMES = [
         "start_time": "2026-02-22T22:00:00Z",
         "category": "basketball",
     },
-]
+])
 
-SAMPLE_ODDS = {
-    "sample-001": [
+SAMPLE_ODDS: Mapping[str, tuple[Mapping[str, Any], ...]] = MappingProxyType({
+    "sample-001": _frozen_rows([
         {"game_id": "sample-001", "market_type": "moneyline", "bookmaker": "DraftKings", "price": -150, "outcome_side": "home", "line_value": None},
         {"game_id": "sample-001", "market_type": "moneyline", "bookmaker": "FanDuel", "price": 130, "outcome_side": "away", "line_value": None},
         {"game_id": "sample-001", "market_type": "spread", "bookmaker": "DraftKings", "price": -110, "outcome_side": "home", "line_value": -3.5},
         {"game_id": "sample-001", "market_type": "spread", "bookmaker": "FanDuel", "price": -105, "outcome_side": "away", "line_value": 3.5},
         {"game_id": "sample-001", "market_type": "points_total", "bookmaker": "DraftKings", "price": -110, "outcome_side": "over", "line_value": 220.5},
         {"game_id": "sample-001", "market_type": "points_total", "bookmaker": "ESPNBet", "price": -108, "outcome_side": "under", "line_value": 220.5},
-    ],
-    "sample-002": [
+    ]),
+    "sample-002": _frozen_rows([
         {"game_id": "sample-002", "market_type": "moneyline", "bookmaker": "FanDuel", "price": 120, "outcome_side": "home", "line_value": None},
         {"game_id": "sample-002", "market_type": "moneyline", "bookmaker": "ESPNBet", "price": -140, "outcome_side": "away", "line_value": None},
         {"game_id": "sample-002", "market_type": "spread", "bookmaker": "FanDuel", "price": -108, "outcome_side": "home", "line_value": 2.5},
         {"game_id": "sample-002", "market_type": "spread", "bookmaker": "ESPNBet", "price": -112, "outcome_side": "away", "line_value": -2.5},
         {"game_id": "sample-002", "market_type": "points_total", "bookmaker": "DraftKings", "price": -105, "outcome_side": "over", "line_value": 228.0},
         {"game_id": "sample-002", "market_type": "points_total", "bookmaker": "FanDuel", "price": -115, "outcome_side": "under", "line_value": 228.0},
-    ],
-}
+    ]),
+})
+
+
+def _sample_games() -> list[dict]:
+    return [dict(game) for game in SAMPLE_GAMES]
+
+
+def _sample_odds(game_id: str) -> list[dict]:
+    return [dict(row) for row in SAMPLE_ODDS.get(game_id, ())]
+
 
 # Cache for games fetched from sports APIs
 _cached_games: list[dict] | None = None
 _cached_odds: dict[str, list[dict]] | None = None
+# _cached_games grouped by lowercased category; rebuilt lazily after a refresh
+_cached_games_by_category: dict[str, list[dict]] | None = None
+# time.monotonic() after which _cached_games is refetched
+_cached_games_expires_at: float = 0.0
+# Guards the single in-flight background refresh
+_refresh_lock = threading.Lock()
+_refreshing = False
+# Game ids whose odds were prefetched and not yet read, plus hit counters
+_prefetch_lock = threading.Lock()
+_prefetched_ids: set[str] = set()
+_prefetch_stats = {"prefetched": 0, "hits": 0}
+# Set while a blocking (cold/hard-expired) load is running; concurrent
+# callers wait on it instead of starting their own. A concurrent.futures
+# Future is used because callers may be on different event loops.
+_games_loading: concurrent.futures.Future | None = None
+_games_loading_lock = threading.Lock()
+
+
+class CacheEntry(NamedTuple):
+    """A cached Databricks result, valid until *expires_at* (monotonic)."""
+
+    value: Any
+    expires_at: float
+    version: int
+
+
+# Databricks results: games keyed by lowercased category (None = all),
+# odds keyed by game_id. Entries from an older _cache_version are ignored.
+_games_entries: dict[Optional[str], CacheEntry] = {}
+_odds_entries: dict[str, CacheEntry] = {}
+_cache_version = 0
+# time.monotonic() after which the next _cache_put sweeps out dead entries
+_next_sweep_at = 0.0
+
+
+def _cache_get(cache: dict, key: Any) -> Any:
+    """Return the live value cached under *key*, or None if missing/stale."""
+    entry = cache.get(key)
+    if entry is None or entry.version != _cache_version:
+        return None
+    if entry.expires_at <= time.monotonic():
+        return None
+    return entry.value
+
+
+def _cache_put(cache: dict, key: Any, value: Any, ttl: float, version: int) -> None:
+    """Store *value* under *key*, stamped with the *version* read before fetching it.
+
+    Stamping the caller's version (rather than the current one) means a
+    result whose query was in flight across :func:`invalidate` is stored
+    already stale.
+    """
+    global _next_sweep_at
+
+    now = time.monotonic()
+    cache[key] = CacheEntry(value, now + ttl, version)
+    if now >= _next_sweep_at:
+        _next_sweep_at = now + settings.odds_cache_ttl_seconds
+        _sweep_dead_entries(now)
+
+
+def _sweep_dead_entries(now: float) -> None:
+    """Drop expired or orphaned entries, e.g. odds for games no longer listed."""
+    for cache in (_games_entries, _odds_entries):
+        for key, entry in list(cache.items()):
+            if entry.expires_at <= now or entry.version != _cache_version:
+                cache.pop(key, None)
+
+
+def invalidate(kind: str = "all", game_id: Optional[str] = None) -> None:
+    """Drop cached data so the next read refetches it.
+
+    Intended to be called when upstream data is known to have changed.
+
+    Args:
+        kind: ``"games"``, ``"odds"`` or ``"all"``.
+        game_id: With ``kind="odds"``, drop only this game's odds.
+    """
+    global _cached_games, _cached_odds, _cached_games_by_category, _cache_version
+
+    if kind not in ("games", "odds", "all"):
+        raise ValueError(f"Unknown cache kind '{kind}'")
+
+    if kind == "odds" and game_id is not None:
+        _odds_entries.pop(game_id, None)
+        _odds_bytes.pop(game_id, None)
+        return
+
+    if kind in ("games", "all"):
+        # Sports-API odds are generated together with the games, so both go
+        for gid in _cached_odds or ():
+            _odds_bytes.pop(gid, None)
+        _cached_games = None
+        _cached_odds = None
+        _cached_games_by_category = None
+        _games_entries.clear()
+    if kind in ("odds", "all"):
+        _odds_entries.clear()
+        _odds_bytes.clear()
+        with _prefetch_lock:
+            _prefetched_ids.clear()
+    # Orphan anything written by a request that was in flight
+    _cache_version += 1
+
+
+def _index_by_category(games: list[dict]) -> dict[str, list[dict]]:
+    index: dict[str, list[dict]] = {}
+    for game in games:
+        index.setdefault(game.get("category", "").lower(), []).append(game)
+    return index
 
 
 def _generate_synthetic_game(category: str, index: int) -> dict:
     """Generate a synthetic game for visualization when real games aren't available."""
-    random.seed(hash(f"{category}-{index}"))
+    rng = random.Random(hash(f"{category}-{index}"))
 
     teams_by_sport = {
         "basketball": [
@@ -121,7 +352,7 @@ def _generate_synthetic_game(category: str, index: int) -> dict:
     home, away = matchups[index % len(matchups)]
 
     from datetime import datetime, timedelta, timezone
-    start_time = (datetime.now(timezone.utc) + timedelta(days=random.randint(1, 30))).isoformat()
+    start_time = (datetime.now(timezone.utc) + timedelta(days=rng.randint(1, 30))).isoformat()
 
     return {
         "game_id": f"synthetic-{category}-{index}",
@@ -132,237 +363,364 @@ def _generate_synthetic_game(category: str, index: int) -> dict:
     }
 
 
-def _generate_varied_odds(game_id: str, seed_offset: int = 0) -> list[dict]:
-    """Generate varied odds for a game to ensure 3D visualization spread.
+async def _load_games_from_apis() -> tuple[list[dict], dict[str, list[dict]]]:
+    """Fetch upcoming games from the sports APIs and build their odds.
+
+    Builds new containers rather than mutating the cache, so readers keep
+    seeing the previous snapshot until :func:`_store_games` swaps it in.
+    Raises if the upstream fetch fails.
+    """
+    target_games = 150  # Target number of games to fetch
+    logger.info("Fetching %d upcoming games from sports APIs", target_games)
+    from app.services.games_service import get_all_upcoming_games
+
+    # Fetch upcoming games from sports APIs
+    upcoming_games = await get_all_upcoming_games()
+
+    # Take up to target_games
+    games, odds = build_cache(upcoming_games[:target_games], target_games)
+
+    logger.info("Fetched %d total games from available sports", len(games))
+
+    # Log breakdown by sport
+    category_counts = {}
+    for game in games:
+        cat = game.get("category", "unknown")
+        category_counts[cat] = category_counts.get(cat, 0) + 1
+    logger.info("Games by sport: %s", category_counts)
 
-    Uses game_id hash + offset as seed for reproducibility.
-    Generates odds that create arbitrage opportunities for visualization.
+    return games, odds
+
+
+def _store_games(games: list[dict], odds: dict[str, list[dict]]) -> None:
+    """Swap in a new games/odds snapshot and restart its TTL."""
+    global _cached_games, _cached_odds, _cached_games_by_category, _cached_games_expires_at
+
+    _cached_games = games
+    _cached_odds = odds
+    _cached_games_by_category = None
+    _cached_games_expires_at = time.monotonic() + settings.games_cache_ttl_seconds
+
+
+async def _load_games_once() -> None:
+    """Load the games cache, sharing one upstream fetch between callers.
+
+    The first caller fetches and stores the snapshot; callers arriving
+    while that is in flight await it and then read the stored result.
     """
-    # Use game_id hash for consistent but varied odds per game
-    random.seed(hash(game_id) + seed_offset)
-
-    # Generate odds that create arbitrage (implied prob sum < 1.0)
-    # To create arb: (1/dec1) + (1/dec2) < 1.0
-    # Generate varied arbitrage margins from 0.5% to 8%
-    arb_margin_pct = random.uniform(0.005, 0.08)  # 0.5% to 8%
-    target_sum = 1.0 - arb_margin_pct
-
-    # Split the implied prob between two sides
-    side1_prob = random.uniform(0.35, 0.65)
-    side2_prob = target_sum - side1_prob
-
-    # Convert to decimal odds then to American
-    dec1 = 1 / side1_prob
-    dec2 = 1 / side2_prob
-
-    def decimal_to_american(dec):
-        if dec >= 2.0:
-            return int((dec - 1) * 100)
-        else:
-            return int(-100 / (dec - 1))
-
-    price1 = decimal_to_american(dec1)
-    price2 = decimal_to_american(dec2)
-
-    # Generate spread values
-    spread_value = round(random.uniform(1.5, 12.5) * 2) / 2
-
-    # Generate spread arb
-    spread_arb = random.uniform(0.005, 0.08)
-    spread_sum = 1.0 - spread_arb
-    spread_prob1 = random.uniform(0.40, 0.60)
-    spread_prob2 = spread_sum - spread_prob1
-    spread_price1 = decimal_to_american(1 / spread_prob1)
-    spread_price2 = decimal_to_american(1 / spread_prob2)
-
-    # Generate total values
-    total_line = round(random.uniform(180.5, 250.5) * 2) / 2
-    total_arb = random.uniform(0.005, 0.08)
-    total_sum = 1.0 - total_arb
-    total_prob1 = random.uniform(0.40, 0.60)
-    total_prob2 = total_sum - total_prob1
-    over_price = decimal_to_american(1 / total_prob1)
-    under_price = decimal_to_american(1 / total_prob2)
-
-    return [
-        # Moneyline
-        {"game_id": game_id, "market_type": "moneyline", "bookmaker": "DraftKings", "price": price1, "outcome_side": "home", "line_value": None},
-        {"game_id": game_id, "market_type": "moneyline", "bookmaker": "FanDuel", "price": price2, "outcome_side": "away", "line_value": None},
-        # Spread
-        {"game_id": game_id, "market_type": "spread", "bookmaker": "DraftKings", "price": spread_price1, "outcome_side": "home", "line_value": -spread_value},
-        {"game_id": game_id, "market_type": "spread", "bookmaker": "FanDuel", "price": spread_price2, "outcome_side": "away", "line_value": spread_value},
-        # Total
-        {"game_id": game_id, "market_type": "points_total", "bookmaker": "DraftKings", "price": over_price, "outcome_side": "over", "line_value": total_line},
-        {"game_id": game_id, "market_type": "points_total", "bookmaker": "ESPNBet", "price": under_price, "outcome_side": "under", "line_value": total_line},
-    ]
+    global _games_loading
+
+    with _games_loading_lock:
+        loading = _games_loading
+        if loading is None:
+            _games_loading = concurrent.futures.Future()
+    if loading is not None:
+        await asyncio.wrap_future(loading)
+        return
+
+    try:
+        try:
+            games, odds = await _load_games_from_apis()
+        except Exception as e:
+            logger.error("Failed to fetch from sports APIs (%s) — using sample data", e, exc_info=True)
+            games, odds = [], {}
+        if not games:
+            logger.warning("No games fetched from sports APIs - using sample data")
+            games = _sample_games()
+            odds = {gid: _sample_odds(gid) for gid in SAMPLE_ODDS}
+        _store_games(games, odds)
+    finally:
+        with _games_loading_lock:
+            done, _games_loading = _games_loading, None
+        done.set_result(None)
+
+
+def _start_background_refresh() -> None:
+    """Refresh the sports-API games cache in a daemon thread.
+
+    At most one refresh runs at a time. A thread (with its own event loop)
+    is used rather than a task because sync callers reach this through
+    :func:`_run_sync`, whose loop is torn down as soon as they return.
+    """
+    global _refreshing
+
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+
+    def _worker() -> None:
+        global _refreshing
+        try:
+            games, odds = asyncio.run(_load_games_from_apis())
+            if games:
+                _store_games(games, odds)
+            else:
+                logger.warning("Background refresh fetched no games - keeping cached data")
+        except Exception:
+            logger.warning("Background games refresh failed - keeping cached data", exc_info=True)
+        finally:
+            with _refresh_lock:
+                _refreshing = False
+
+    threading.Thread(target=_worker, name="games-cache-refresh", daemon=True).start()
+
+
+def _start_odds_prefetch(game_ids: list[str]) -> None:
+    """Warm the odds cache for *game_ids* in a daemon thread.
+
+    Callers usually drill into games they have just listed, so fetching
+    their odds up front turns the follow-up fetch_odds_for_game into a
+    cache hit. Runs in a thread for the same reason as the games refresh.
+    """
+    def _worker() -> None:
+        try:
+            fetched = asyncio.run(fetch_odds_for_games_async(game_ids))
+        except Exception:
+            logger.warning("Odds prefetch failed", exc_info=True)
+            return
+        with _prefetch_lock:
+            new_ids = fetched.keys() - _prefetched_ids
+            _prefetched_ids.update(new_ids)
+            _prefetch_stats["prefetched"] += len(new_ids)
+
+    threading.Thread(target=_worker, name="odds-prefetch", daemon=True).start()
+
+
+def prefetch_stats() -> dict[str, int]:
+    """Return how many prefetched games were later read (``hits``)."""
+    with _prefetch_lock:
+        return dict(_prefetch_stats)
+
+
+def _run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run *coro* to completion from synchronous code.
+
+    ``asyncio.run`` cannot be used from a thread that already has a running
+    event loop, so in that case the coroutine runs on a fresh loop in a
+    short-lived worker thread and the caller blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: dict[str, Any] = {}
+
+    def _worker() -> None:
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as exc:
+            result["error"] = exc
+
+    thread = threading.Thread(target=_worker, name="delta-lake-sync", daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
 
 
 # ── Public API ────────────────────────────────────────────────────────
 
+async def warm_up() -> None:
+    """Create the Databricks client and run a trivial query.
+
+    Called at app startup so the OAuth handshake and warehouse connection
+    happen before the first request. Failures are logged, not raised.
+    """
+    if not _databricks_available():
+        return
+    try:
+        await _get_client().execute_sql_async("SELECT 1", settings.databricks_warehouse_id)
+        logger.info("Databricks client warmed up")
+    except Exception:
+        logger.warning("Databricks warm-up failed", exc_info=True)
+
+
 def fetch_upcoming_games(category: Optional[str] = None, force_refresh: bool = False) -> list[dict]:
+    """Fetch upcoming games from Databricks or sports APIs.
+
+    Synchronous wrapper around :func:`fetch_upcoming_games_async`; async
+    callers should await that directly.
+    """
+    return _run_sync(fetch_upcoming_games_async(category, force_refresh))
+
+
+async def fetch_upcoming_games_async(
+    category: Optional[str] = None, force_refresh: bool = False
+) -> list[dict]:
     """Fetch upcoming games from Databricks or sports APIs."""
-    global _cached_games, _cached_odds
+    global _cached_games_by_category
 
     # Allow forcing a cache refresh
     if force_refresh:
-        _cached_games = None
-        _cached_odds = None
+        invalidate("games")
         logger.info("Cache cleared - forcing fresh fetch")
 
     if _databricks_available():
+        cache_key = category.lower() if category else None
+        cached = _cache_get(_games_entries, cache_key)
+        if cached is not None:
+            return cached
+        version = _cache_version
         try:
             where = ""
+            params = None
             if category:
-                where = f" WHERE category = '{category}'"
+                # Bind the same normalized value the cache is keyed on
+                where = " WHERE lower(category) = :category"
+                params = {"category": cache_key}
             sql = f"SELECT * FROM {settings.delta_games_table}{where} ORDER BY start_time"
-            rows = _get_client().execute_sql(sql, settings.databricks_warehouse_id)
+            rows = await _execute_with_retry_async(sql, params)
             if rows:
+                _cache_put(_games_entries, cache_key, rows,
+                           settings.games_cache_ttl_seconds, version)
+                if settings.odds_prefetch_count > 0:
+                    _start_odds_prefetch(
+                        [r["game_id"] for r in rows[:settings.odds_prefetch_count]])
                 return rows
         except Exception:
             logger.warning("Databricks unavailable — fetching from sports APIs")
 
-    # Fetch from sports APIs when Databricks is not configured
-    if _cached_games is None:
-        target_games = 150  # Target number of games to fetch
-        logger.info("Fetching %d upcoming games from sports APIs", target_games)
-        try:
-            from app.services.games_service import get_all_upcoming_games
-
-            # Fetch upcoming games from sports APIs
-            upcoming_games = asyncio.run(get_all_upcoming_games())
-
-            # Take up to target_games
-            games_to_cache = upcoming_games[:target_games]
-
-            _cached_games = []
-            _cached_odds = {}
-
-            # Organize real games by category
-            games_by_category = {"basketball": [], "baseball": [], "hockey": [], "football": []}
-            for game in games_to_cache:
-                cat = game.category.lower()
-                if cat in games_by_category:
-                    games_by_category[cat].append(game)
-
-            # Just use all available games, distributed evenly
-            # Take up to target_games total, prioritizing even distribution
-            game_index = 0
-            games_per_sport = target_games // 4  # Try to get 37-38 per sport
-
-            # First pass: try to get games_per_sport from each sport
-            for sport_category in ["basketball", "baseball", "hockey", "football"]:
-                available = games_by_category[sport_category]
-                to_add = min(len(available), games_per_sport)
-
-                for game in available[:to_add]:
-                    game_id = f"{game.category}-{game.home_team.replace(' ', '-')}-{game.away_team.replace(' ', '-')}-{game_index}"
-                    game_dict = {
-                        "game_id": game_id,
-                        "home_team": game.home_team,
-                        "away_team": game.away_team,
-                        "start_time": game.start_time,
-                        "category": game.category,
-                    }
-                    _cached_games.append(game_dict)
-                    _cached_odds[game_id] = _generate_varied_odds(game_id, seed_offset=game_index)
-                    game_index += 1
-
-            # Second pass: if we're under target, fill from sports with extra games
-            remaining_needed = target_games - len(_cached_games)
-            if remaining_needed > 0:
-                logger.info("Need %d more games to reach target - filling from available sports", remaining_needed)
-                for sport_category in ["basketball", "hockey", "baseball", "football"]:
-                    if remaining_needed <= 0:
-                        break
-
-                    available = games_by_category[sport_category]
-                    already_used = min(len(available), games_per_sport)
-                    extra_available = available[already_used:]
-
-                    for game in extra_available[:remaining_needed]:
-                        game_id = f"{game.category}-{game.home_team.replace(' ', '-')}-{game.away_team.replace(' ', '-')}-{game_index}"
-                        game_dict = {
-                            "game_id": game_id,
-                            "home_team": game.home_team,
-                            "away_team": game.away_team,
-                            "start_time": game.start_time,
-                            "category": game.category,
-                        }
-                        _cached_games.append(game_dict)
-                        _cached_odds[game_id] = _generate_varied_odds(game_id, seed_offset=game_index)
-                        game_index += 1
-                        remaining_needed -= 1
-
-            logger.info("Cached %d total games from available sports", len(_cached_games))
-
-            # Log breakdown by sport
-            category_counts = {}
-            for game in _cached_games:
-                cat = game.get("category", "unknown")
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-            logger.info("Games by sport: %s", category_counts)
-
-            # If no games were fetched, fall back to sample data
-            if len(_cached_games) == 0:
-                logger.warning("No games fetched from sports APIs - using sample data")
-                _cached_games = SAMPLE_GAMES
-                _cached_odds = SAMPLE_ODDS
-        except Exception as e:
-            logger.error("Failed to fetch from sports APIs (%s) — using sample data", e, exc_info=True)
-            _cached_games = SAMPLE_GAMES
-            _cached_odds = SAMPLE_ODDS
+    # Fetch from sports APIs when Databricks is not configured. Within the
+    # stale window an expired cache is still served while a background
+    # refresh replaces it; past that, callers wait for a fresh fetch.
+    now = time.monotonic()
+    if (_cached_games is None
+            or now >= _cached_games_expires_at + settings.games_cache_stale_seconds):
+        await _load_games_once()
+    elif now >= _cached_games_expires_at:
+        _start_background_refresh()
 
     # Filter by category if requested
     games = _cached_games if _cached_games is not None else []
     if category:
-        games = [g for g in games if g.get("category", "").lower() == category.lower()]
+        if _cached_games_by_category is None:
+            _cached_games_by_category = _index_by_category(games)
+        games = _cached_games_by_category.get(category.lower(), [])
 
     # Final fallback: if we somehow have no games, use sample data
     if len(games) == 0 and category is None:
         logger.warning("No games available - using sample data as final fallback")
-        return SAMPLE_GAMES
+        return _sample_games()
 
     return games
 
 
+def _cached_game_odds(game_id: str) -> Optional[list[dict]]:
+    """Return live cached Databricks odds for *game_id*, counting prefetch hits."""
+    cached = _cache_get(_odds_entries, game_id)
+    if cached is not None and game_id in _prefetched_ids:
+        with _prefetch_lock:
+            if game_id in _prefetched_ids:
+                _prefetched_ids.discard(game_id)
+                _prefetch_stats["hits"] += 1
+    return cached
+
+
+def _fallback_game_odds(game_id: str) -> list[dict]:
+    # Use cached odds if available
+    if _cached_odds is not None:
+        return _cached_odds.get(game_id, [])
+    return _sample_odds(game_id)
+
+
 def fetch_odds_for_game(game_id: str) -> list[dict]:
     """Fetch all odds rows for a single game."""
-    global _cached_odds
+    if _databricks_available():
+        cached = _cached_game_odds(game_id)
+        if cached is not None:
+            return cached
+        version = _cache_version
+        try:
+            sql = f"SELECT * FROM {settings.delta_odds_table} WHERE game_id = :game_id"
+            rows = _normalize_odds_rows(_execute_with_retry(sql, {"game_id": game_id}))
+            if rows:
+                _cache_put(_odds_entries, game_id, rows,
+                           settings.odds_cache_ttl_seconds, version)
+                return rows
+        except Exception:
+            logger.warning("Databricks unavailable — using cached odds")
+
+    return _fallback_game_odds(game_id)
 
+
+async def fetch_odds_for_game_async(game_id: str) -> list[dict]:
+    """Async variant of :func:`fetch_odds_for_game`."""
     if _databricks_available():
+        cached = _cached_game_odds(game_id)
+        if cached is not None:
+            return cached
+        version = _cache_version
         try:
-            sql = (
-                f"SELECT * FROM {settings.delta_odds_table} "
-                f"WHERE game_id = '{game_id}'"
+            sql = f"SELECT * FROM {settings.delta_odds_table} WHERE game_id = :game_id"
+            rows = _normalize_odds_rows(
+                await _execute_with_retry_async(sql, {"game_id": game_id})
             )
-            rows = _get_client().execute_sql(sql, settings.databricks_warehouse_id)
             if rows:
+                _cache_put(_odds_entries, game_id, rows,
+                           settings.odds_cache_ttl_seconds, version)
                 return rows
         except Exception:
             logger.warning("Databricks unavailable — using cached odds")
 
-    # Use cached odds if available
-    if _cached_odds is not None:
-        return _cached_odds.get(game_id, [])
-    return SAMPLE_ODDS.get(game_id, [])
+    return _fallback_game_odds(game_id)
 
 
 def fetch_odds_for_games(game_ids: list[str]) -> dict[str, list[dict]]:
+    """Fetch odds for multiple games, keyed by game_id.
+
+    Synchronous wrapper around :func:`fetch_odds_for_games_async`.
+    """
+    return _run_sync(fetch_odds_for_games_async(game_ids))
+
+
+async def fetch_odds_for_games_async(game_ids: list[str]) -> dict[str, list[dict]]:
     """Fetch odds for multiple games, keyed by game_id."""
     global _cached_odds
 
     if _databricks_available():
+        result: dict[str, list[dict]] = {}
+        missing: list[str] = []
+        for gid in game_ids:
+            cached = _cache_get(_odds_entries, gid)
+            if cached is not None:
+                result[gid] = cached
+            else:
+                missing.append(gid)
+        if not missing:
+            return result
+        version = _cache_version
         try:
-            ids_str = ", ".join(f"'{gid}'" for gid in game_ids)
-            sql = (
-                f"SELECT * FROM {settings.delta_odds_table} "
-                f"WHERE game_id IN ({ids_str})"
-            )
-            rows = _get_client().execute_sql(sql, settings.databricks_warehouse_id)
-            if rows:
-                result: dict[str, list[dict]] = {}
+            sem = asyncio.Semaphore(_SQL_MAX_CONCURRENCY)
+
+            async def _run_chunk(chunk: list[str]) -> list[dict]:
+                placeholders, params = _in_clause(chunk)
+                sql = (
+                    f"SELECT * FROM {settings.delta_odds_table} "
+                    f"WHERE game_id IN ({placeholders})"
+                )
+                async with sem:
+                    return _normalize_odds_rows(
+                        await _execute_with_retry_async(sql, params)
+                    )
+
+            # Chunk the IN list so statements stay bounded; every full chunk
+            # has the same shape, which lets the warehouse reuse its plan
+            chunk_rows = await asyncio.gather(*(
+                _run_chunk(missing[start:start + _SQL_BATCH_SIZE])
+                for start in range(0, len(missing), _SQL_BATCH_SIZE)
+            ))
+            fetched: dict[str, list[dict]] = {}
+            for rows in chunk_rows:
                 for row in rows:
-                    result.setdefault(row["game_id"], []).append(row)
+                    fetched.setdefault(row["game_id"], []).append(row)
+            for gid, rows in fetched.items():
+                _cache_put(_odds_entries, gid, rows,
+                           settings.odds_cache_ttl_seconds, version)
+            result.update(fetched)
+            if result:
                 return result
         except Exception:
             logger.warning("Databricks unavailable — using cached odds")
@@ -370,4 +728,22 @@ def fetch_odds_for_games(game_ids: list[str]) -> dict[str, list[dict]]:
     # Use cached odds if available
     if _cached_odds is not None:
         return {gid: _cached_odds.get(gid, []) for gid in game_ids}
-    return {gid: SAMPLE_ODDS.get(gid, []) for gid in game_ids}
+    return {gid: _sample_odds(gid) for gid in game_ids}
+
+# Encoded odds per game, stored with the rows they were encoded from. A body
+# is reused while fetch_odds_for_game returns those same (or equal) rows, so
+# a cache refresh or invalidation naturally re-encodes. Equality covers the
+# sample fallback, which hands out a fresh copy on every call.
+_odds_bytes: dict[str, tuple[list[dict], bytes]] = {}
+
+
+def fetch_odds_bytes(game_id: str) -> bytes:
+    """Fetch a game's odds as a JSON-encoded response body."""
+    rows = fetch_odds_for_game(game_id)
+    memo = _odds_bytes.get(game_id)
+    if memo is not None and (memo[0] is rows or memo[0] == rows):
+        return memo[1]
+    body = dumps([dict(row) for row in rows])
+    if rows:
+        _odds_bytes[game_id] = (rows, body)
+    return body
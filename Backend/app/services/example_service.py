@@ -1,5 +1,12 @@
-def get_health_info() -> dict:
-    return {
-        "status": "ok",
-        "message": "Hackalytics API is running",
-    }
+from types import MappingProxyType
+from typing import Mapping
+
+# Static, so build it once; read-only so callers can't alter the shared copy
+_HEALTH: Mapping[str, str] = MappingProxyType({
+    "status": "ok",
+    "message": "Hackalytics API is running",
+})
+
+
+def get_health_info() -> Mapping[str, str]:
+    return _HEALTH
@@ -7,24 +7,27 @@ best bookmaker pair, runs model inference, and assembles the response.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections import defaultdict
 from typing import Optional
 
 import numpy as np
 import torch
 
+from app.config import settings
 from app.models.market_prediction import (
     AllGamesPredictionResponse,
     GamePredictionResponse,
-    MarketPrediction,
 )
 from app.services.delta_lake_service import (
     fetch_odds_for_game,
+    fetch_odds_for_game_async,
     fetch_odds_for_games,
+    fetch_odds_for_games_async,
     fetch_upcoming_games,
+    fetch_upcoming_games_async,
 )
-from app.services.local_model_service import MARKET_TYPE_MAP, engineer_features
+from app.services.local_model_service import MARKET_TYPE_MAP, engineer_snapshot_features
 from app.services.prediction_service import _get_model_service
 
 logger = logging.getLogger(__name__)
@@ -39,148 +42,246 @@ _MODEL_KEY = {
     "points_total": "POINTS_TOTAL",
 }
 
+# Position of each market type in MARKET_TYPES. Odds rows arrive with
+# lowercased, interned market_type strings, so this is a single dict hit.
+_MARKET_POS = {mt: i for i, mt in enumerate(MARKET_TYPES)}
 
-def _american_to_decimal(american: int) -> float:
-    """Convert American odds to decimal odds."""
-    if american >= 0:
-        return (american / 100) + 1
-    return (100 / abs(american)) + 1
-
+# Model market embedding index, by position in MARKET_TYPES
+_MODEL_INDEX = np.array(
+    [MARKET_TYPE_MAP[_MODEL_KEY[mt]] for mt in MARKET_TYPES], dtype=np.int64
+)
 
-def _pick_best_pair(odds_rows: list[dict]) -> tuple[dict, dict] | None:
-    """Pick the two odds rows with the lowest combined implied probability.
+# Every scored pair is a single visible timestep; expanded per batch
+_ALL_VISIBLE = torch.ones(1, 1, dtype=torch.bool)
 
-    This maximises arb potential. Returns None if fewer than 2 rows.
-    """
-    if len(odds_rows) < 2:
-        return None
+# Prediction text for markets whose best pair leaves no room for arbitrage
+_NO_ARB_PREDICTION = "no arbitrage"
 
-    best_pair = None
-    best_combined = float("inf")
 
-    for i in range(len(odds_rows)):
-        for j in range(i + 1, len(odds_rows)):
-            dec_i = _american_to_decimal(int(odds_rows[i]["price"]))
-            dec_j = _american_to_decimal(int(odds_rows[j]["price"]))
-            combined = (1 / dec_i) + (1 / dec_j)
-            if combined < best_combined:
-                best_combined = combined
-                best_pair = (odds_rows[i], odds_rows[j])
+def _american_to_decimal(prices: np.ndarray) -> np.ndarray:
+    """Convert an array of American odds to decimal odds."""
+    with np.errstate(divide="ignore"):
+        return np.where(prices >= 0, prices / 100 + 1, 100 / np.abs(prices) + 1)
 
-    return best_pair
 
-
-def _derive_prediction(market_type: str, confidence: float, row_1: dict, row_2: dict) -> str:
-    """Build human-readable prediction text from market type and odds context."""
+def _derive_prediction(
+    market_type: str,
+    confidence: float,
+    side: str,
+    line_1: float | None,
+    line_2: float | None,
+) -> str:
+    """Build human-readable prediction text from market type and odds context.
+
+    *side* is the first row's outcome side; *line_1*/*line_2* are the
+    rows' line values, already floats (or None) from the data layer.
+    """
     if market_type == "spread":
-        side = row_1.get("outcome_side", "home")
-        value = row_1.get("line_value")
-        if value is not None:
-            sign = "+" if float(value) > 0 else ""
-            return f"{side} {sign}{float(value)}"
+        if line_1 is not None:
+            sign = "+" if line_1 > 0 else ""
+            return f"{side} {sign}{line_1}"
         return f"{side} spread"
 
     if market_type == "points_total":
-        value = row_1.get("line_value") or row_2.get("line_value")
+        # A 0.0 line is a real line, so fall back only on None
+        line = line_1 if line_1 is not None else line_2
         direction = "over" if confidence >= 0.5 else "under"
-        if value is not None:
-            return f"{direction} {float(value)}"
+        if line is not None:
+            return f"{direction} {line}"
         return direction
 
     # moneyline
-    side = row_1.get("outcome_side", "home")
     return f"{side} win"
 
 
-def _score_market(
-    market_type: str,
-    row_1: dict,
-    row_2: dict,
-) -> MarketPrediction:
-    """Run model inference on a single market pair and return a MarketPrediction."""
-    dec_1 = _american_to_decimal(int(row_1["price"]))
-    dec_2 = _american_to_decimal(int(row_2["price"]))
-
-    features = engineer_features(
-        np.array([dec_1], dtype=np.float64),
-        np.array([dec_2], dtype=np.float64),
-    )
+def _best_pairs(
+    odds_by_game: list[list[dict]],
+) -> tuple[list[tuple[int, str, dict, dict]], np.ndarray, np.ndarray, np.ndarray]:
+    """Pick the best bookmaker pair for every (game, market) at once.
 
-    features_t = torch.tensor(features, dtype=torch.float64).unsqueeze(0)
-    mask_t = torch.ones(1, 1, dtype=torch.bool)
+    The best pair is the one with the lowest combined implied probability
+    (maximising arb potential). That is a plain sum, so it is simply the
+    two rows with the lowest individual implied probability. All rows are
+    flattened into arrays and sorted by (group, implied) in one pass; ties
+    resolve to the earliest rows, and each pair keeps its row order.
 
-    model_key = _MODEL_KEY.get(market_type, "MONEYLINE")
-    market_idx = MARKET_TYPE_MAP.get(model_key, 0)
-    market_t = torch.tensor([market_idx], dtype=torch.long)
+    Returns ``(meta, market_idx, dec_1, dec_2)`` where ``meta[i]`` is
+    ``(game_idx, market_type, row_1, row_2)``, ordered by game and then
+    by MARKET_TYPES, ``market_idx`` holds each pair's model market index
+    and ``dec_1``/``dec_2`` hold the pairs' decimal odds.
+    """
+    market_pos = _MARKET_POS
+    n_markets = len(MARKET_TYPES)
+    rows: list[dict] = []
+    groups: list[int] = []
+    prices: list[int] = []
+    for game_idx, odds_rows in enumerate(odds_by_game):
+        for row in odds_rows:
+            pos = market_pos.get(row.get("market_type"))
+            if pos is not None:
+                rows.append(row)
+                groups.append(game_idx * n_markets + pos)
+                prices.append(int(row["price"]))
+
+    empty = np.empty(0)
+    if len(rows) < 2:
+        return [], _MODEL_INDEX[:0], empty, empty
+
+    group = np.asarray(groups, dtype=np.int64)
+    dec = _american_to_decimal(np.asarray(prices, dtype=np.int64))
+    implied = 1.0 / dec
+
+    # lexsort is stable: within a group, equal probabilities keep row order
+    order = np.lexsort((implied, group))
+    sorted_group = group[order]
+    starts = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    starts = starts[counts >= 2]
+    if len(starts) == 0:
+        return [], _MODEL_INDEX[:0], empty, empty
+
+    first = np.minimum(order[starts], order[starts + 1])
+    second = np.maximum(order[starts], order[starts + 1])
+    pair_group = sorted_group[starts]
+    meta = [
+        (g // n_markets, MARKET_TYPES[g % n_markets], rows[i], rows[j])
+        for g, i, j in zip(pair_group.tolist(), first.tolist(), second.tolist())
+    ]
+    return meta, _MODEL_INDEX[pair_group % n_markets], dec[first], dec[second]
+
+
+def _predict_scores(
+    features: torch.Tensor, mask: torch.Tensor, market: torch.Tensor
+) -> list[float | None]:
+    """Score a batch of pairs, with ``None`` for any pair that failed.
+
+    The batch is scored in one call; if that raises, each pair is retried
+    on its own so one bad pair only loses itself.
+    """
+    n = len(market)
+    try:
+        service = _get_model_service()
+    except Exception:
+        logger.warning("Model unavailable; %d markets not scored", n, exc_info=True)
+        return [None] * n
+    try:
+        return list(service.predict_batch(features, mask, market))
+    except Exception:
+        logger.warning("Failed to score %d markets as a batch; retrying one at a time",
+                       n, exc_info=True)
+
+    scores: list[float | None] = []
+    for i in range(n):
+        try:
+            scores.append(service.predict_batch(
+                features[i:i + 1], mask[i:i + 1], market[i:i + 1])[0])
+        except Exception:
+            logger.warning("Failed to score market", exc_info=True)
+            scores.append(None)
+    return scores
 
-    svc = _get_model_service()
-    score = svc.predict(features_t, mask_t, market_t)
-    confidence = float(score.item())
 
-    prediction_text = _derive_prediction(market_type, confidence, row_1, row_2)
+def _score_games(
+    games: list[dict], odds_by_game: list[list[dict]]
+) -> list[list[dict]]:
+    """Score every market of every game with a single batched forward pass.
 
-    return MarketPrediction(
-        market_type=market_type,
-        confidence=confidence,
-        bookmaker_1=row_1.get("bookmaker", "unknown"),
-        bookmaker_2=row_2.get("bookmaker", "unknown"),
-        price_1=int(row_1["price"]),
-        price_2=int(row_2["price"]),
-        prediction=prediction_text,
-    )
+    Markets whose best pair has a combined implied probability at or above
+    ``settings.no_arb_skip_threshold`` cannot be arbitraged, so they skip
+    the model and are reported with confidence 0.0 and the prediction
+    ``"no arbitrage"``.
 
+    Markets the model fails to score are left out; the rest of the game,
+    including its no-arbitrage markets, is still returned.
 
-def _build_game_prediction(game: dict, odds_rows: list[dict]) -> GamePredictionResponse:
-    """Build a full GamePredictionResponse for one game."""
-    # Group odds by market_type
-    by_market: dict[str, list[dict]] = defaultdict(list)
-    for row in odds_rows:
-        mt = row.get("market_type", "").lower()
-        if mt in MARKET_TYPES:
-            by_market[mt].append(row)
-
-    markets: list[MarketPrediction] = []
-    for mt in MARKET_TYPES:
-        rows = by_market.get(mt, [])
-        pair = _pick_best_pair(rows)
-        if pair is None:
+    Returns one list of MarketPrediction-shaped dicts per game, in the
+    order of *games*; they are validated into models by the caller.
+    """
+    markets: list[list[dict]] = [[] for _ in games]
+    meta, market_idx, dec_1, dec_2 = _best_pairs(odds_by_game)
+    if not meta:
+        return markets
+
+    no_arb = np.reciprocal(dec_1) + np.reciprocal(dec_2) >= settings.no_arb_skip_threshold
+    scored = np.flatnonzero(~no_arb)
+    confidences: list[float | None] = [0.0] * len(meta)
+    if len(scored):
+        if len(scored) < len(meta):
+            dec_1, dec_2, market_idx = dec_1[scored], dec_2[scored], market_idx[scored]
+
+        # Zero-copy views over the NumPy buffers; the mask is a broadcast view
+        features_t = torch.from_numpy(engineer_snapshot_features(dec_1, dec_2))  # (B, 1, 10)
+        mask_t = _ALL_VISIBLE.expand(len(scored), 1)
+        market_t = torch.from_numpy(market_idx)
+        scores = _predict_scores(features_t, mask_t, market_t)
+        if len(scored) == len(meta):
+            confidences = scores
+        else:
+            for i, score in zip(scored.tolist(), scores):
+                confidences[i] = score
+
+    for (game_idx, mt, row_1, row_2), confidence, skip in zip(
+        meta, confidences, no_arb.tolist()
+    ):
+        if confidence is None:
             continue
-        try:
-            mp = _score_market(mt, pair[0], pair[1])
-            markets.append(mp)
-        except Exception:
-            logger.warning("Failed to score %s for game %s", mt, game.get("game_id"), exc_info=True)
-
-    return GamePredictionResponse(
-        game_id=game.get("game_id", "unknown"),
-        category=game.get("category", "basketball"),
-        home_team=game.get("home_team", "unknown"),
-        away_team=game.get("away_team", "unknown"),
-        start_time=game.get("start_time", ""),
-        markets=markets,
-    )
+        if skip:
+            prediction = _NO_ARB_PREDICTION
+        else:
+            prediction = _derive_prediction(
+                mt,
+                confidence,
+                row_1.get("outcome_side", "home"),
+                row_1.get("line_value"),
+                row_2.get("line_value"),
+            )
+        markets[game_idx].append({
+            "market_type": mt,
+            "confidence": confidence,
+            "bookmaker_1": row_1.get("bookmaker", "unknown"),
+            "bookmaker_2": row_2.get("bookmaker", "unknown"),
+            "price_1": int(row_1["price"]),
+            "price_2": int(row_2["price"]),
+            "prediction": prediction,
+        })
+    return markets
+
+
+def _build_game_prediction(game: dict, markets: list[dict]) -> dict:
+    """Build the GamePredictionResponse-shaped dict for one game."""
+    return {
+        "game_id": game.get("game_id", "unknown"),
+        "category": game.get("category", "basketball"),
+        "home_team": game.get("home_team", "unknown"),
+        "away_team": game.get("away_team", "unknown"),
+        "start_time": game.get("start_time", ""),
+        "markets": markets,
+    }
 
 
 # ── Public API ────────────────────────────────────────────────────────
 
-def get_all_game_predictions(category: Optional[str] = None) -> AllGamesPredictionResponse:
-    """Fetch all upcoming games, run predictions, return response."""
-    games = fetch_upcoming_games(category)
-    game_ids = [g["game_id"] for g in games]
-    all_odds = fetch_odds_for_games(game_ids)
+def _predict_games(
+    games: list[dict], all_odds: dict[str, list[dict]]
+) -> AllGamesPredictionResponse:
+    odds_by_game = [all_odds.get(game["game_id"], []) for game in games]
+    markets_by_game = _score_games(games, odds_by_game)
+    results = [
+        _build_game_prediction(game, markets)
+        for game, markets in zip(games, markets_by_game)
+    ]
 
-    results = []
-    for game in games:
-        gid = game["game_id"]
-        odds = all_odds.get(gid, [])
-        results.append(_build_game_prediction(game, odds))
+    # One validation pass over the whole tree runs entirely in pydantic-core,
+    # rather than one Python-level model __init__ per market and per game
+    return AllGamesPredictionResponse.model_validate({"games": results})
 
-    return AllGamesPredictionResponse(games=results)
 
+def _predict_game(
+    games: list[dict], game_id: str, odds: list[dict]
+) -> GamePredictionResponse | None:
+    if not odds:
+        return None
 
-def get_single_game_prediction(game_id: str) -> GamePredictionResponse | None:
-    """Fetch a single game's data, run predictions, return response."""
-    games = fetch_upcoming_games()
     game = next((g for g in games if g["game_id"] == game_id), None)
 
     if game is None:
@@ -192,8 +293,59 @@ def get_single_game_prediction(game_id: str) -> GamePredictionResponse | None:
             "start_time": "",
         }
 
-    odds = fetch_odds_for_game(game_id)
-    if not odds:
-        return None
+    return GamePredictionResponse.model_validate(
+        _build_game_prediction(game, _score_games([game], [odds])[0])
+    )
+
+
+def get_all_game_predictions(category: Optional[str] = None) -> AllGamesPredictionResponse:
+    """Fetch all upcoming games, run predictions, return response."""
+    games = fetch_upcoming_games(category)
+    all_odds = fetch_odds_for_games([g["game_id"] for g in games])
+    return _predict_games(games, all_odds)
+
+
+def get_single_game_prediction(game_id: str) -> GamePredictionResponse | None:
+    """Fetch a single game's data, run predictions, return response."""
+    return _predict_game(fetch_upcoming_games(), game_id, fetch_odds_for_game(game_id))
 
-    return _build_game_prediction(game, odds)
+
+async def _warm_model() -> None:
+    """Load the model service in a worker thread, ahead of inference.
+
+    Failures are left for inference to report.
+    """
+    try:
+        await asyncio.to_thread(_get_model_service)
+    except Exception:
+        logger.debug("Model warm-up failed", exc_info=True)
+
+
+async def get_all_game_predictions_async(
+    category: Optional[str] = None,
+) -> AllGamesPredictionResponse:
+    """Async variant of :func:`get_all_game_predictions`.
+
+    Games and odds are awaited on the event loop while the model loads in
+    a worker thread; inference then runs in a worker thread as well so
+    the loop stays free.
+    """
+    warm = asyncio.create_task(_warm_model())
+    games = await fetch_upcoming_games_async(category)
+    all_odds = await fetch_odds_for_games_async([g["game_id"] for g in games])
+    await warm
+    return await asyncio.to_thread(_predict_games, games, all_odds)
+
+
+async def get_single_game_prediction_async(game_id: str) -> GamePredictionResponse | None:
+    """Async variant of :func:`get_single_game_prediction`.
+
+    The game list and the game's odds are fetched concurrently, overlapped
+    with model loading.
+    """
+    games, odds, _ = await asyncio.gather(
+        fetch_upcoming_games_async(),
+        fetch_odds_for_game_async(game_id),
+        _warm_model(),
+    )
+    return await asyncio.to_thread(_predict_game, games, game_id, odds)
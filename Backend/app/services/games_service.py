@@ -2,12 +2,15 @@
 Aggregates upcoming games from all four leagues (NBA, MLB, NFL, NHL).
 
 Implements FR-02 (all four leagues per cycle, one failure doesn't block others)
-and FR-06 (retry up to 3 times with exponential backoff: 1 s / 2 s / 4 s).
+and FR-06 (retry up to 3 times with exponential backoff: 1 s / 2 s / 4 s, each
+jittered by ±25% so leagues don't retry in lockstep).
 Results are sorted by start_time ascending (FR-05).
 """
 
 import asyncio
 import logging
+import random
+import time
 from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Callable, Awaitable
@@ -15,6 +18,7 @@ from typing import Callable, Awaitable
 import httpx
 
 from app.models.game import Game
+from app.services.http_client import create_http_client, get_client
 from app.services.nba_service import fetch_upcoming_nba_games, fetch_live_nba_games
 from app.services.mlb_service import fetch_upcoming_mlb_games, fetch_live_mlb_games
 from app.services.nfl_service import fetch_upcoming_nfl_games, fetch_live_nfl_games
@@ -24,25 +28,48 @@ logger = logging.getLogger(__name__)
 
 _MAX_RETRIES = 3
 _BACKOFF_SECONDS = [1, 2, 4]   # FR-06: 1 s / 2 s / 4 s
+_LEAGUE_DEADLINE_SECONDS = 15.0  # give up on a league once retrying would exceed this
+# Client errors that won't go away on retry (408/429 and 5xx still retry)
+_NON_RETRYABLE_STATUS = {400, 401, 403, 404}
 
 LeagueFetcher = Callable[[httpx.AsyncClient], Awaitable[list[Game]]]
 
 
+def _is_retryable(exc: Exception) -> bool:
+    """Only transport failures and non-permanent HTTP statuses are worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code not in _NON_RETRYABLE_STATUS
+    return isinstance(exc, httpx.HTTPError)
+
+
 async def _fetch_with_retry(
     league: str,
     fetcher: LeagueFetcher,
     client: httpx.AsyncClient,
 ) -> list[Game]:
-    """Call `fetcher` up to _MAX_RETRIES times with exponential backoff."""
+    """Call `fetcher` up to _MAX_RETRIES times with jittered exponential backoff.
+
+    Errors that retrying can't fix, or a retry that would run past the
+    league's deadline, skip the league straight away.
+    """
+    deadline = time.monotonic() + _LEAGUE_DEADLINE_SECONDS
     last_exc: Exception | None = None
     for attempt in range(_MAX_RETRIES):
         try:
             return await fetcher(client)
         except Exception as exc:
             last_exc = exc
-            wait = _BACKOFF_SECONDS[min(attempt, len(_BACKOFF_SECONDS) - 1)]
+            if not _is_retryable(exc):
+                logger.error("%s: non-retryable error (%s) — skipping league", league, exc)
+                return []
+            if attempt == _MAX_RETRIES - 1:
+                break
+            wait = _BACKOFF_SECONDS[min(attempt, len(_BACKOFF_SECONDS) - 1)] * random.uniform(0.75, 1.25)
+            if time.monotonic() + wait > deadline:
+                logger.error("%s: retry deadline reached — skipping league. Last error: %s", league, exc)
+                return []
             logger.warning(
-                "%s: attempt %d/%d failed (%s), retrying in %ds",
+                "%s: attempt %d/%d failed (%s), retrying in %.1fs",
                 league, attempt + 1, _MAX_RETRIES, exc, wait,
             )
             await asyncio.sleep(wait)
@@ -51,59 +78,83 @@ async def _fetch_with_retry(
     return []
 
 
-async def get_all_upcoming_games() -> list[Game]:
-    """
-    Fetch upcoming games from all four leagues concurrently.
-    Returns a combined list sorted by start_time ascending.
+async def _fetch_leagues(
+    fetchers: dict[str, LeagueFetcher],
+    client: httpx.AsyncClient | None,
+) -> list[Game]:
+    """Run every league's fetcher concurrently; combine and sort by start_time.
+
+    Uses *client* when given, then the app's shared client, and otherwise
+    a client scoped to this call.
     """
-    async with httpx.AsyncClient(timeout=None) as client:
-        nba_task = _fetch_with_retry("NBA", fetch_upcoming_nba_games, client)
-        mlb_task = _fetch_with_retry("MLB", fetch_upcoming_mlb_games, client)
-        nfl_task = _fetch_with_retry("NFL", fetch_upcoming_nfl_games, client)
-        nhl_task = _fetch_with_retry("NHL", fetch_upcoming_nhl_games, client)
+    if client is None:
+        client = get_client()
+    if client is None:
+        async with create_http_client() as own_client:
+            return await _fetch_leagues(fetchers, own_client)
 
-        results = await asyncio.gather(nba_task, mlb_task, nfl_task, nhl_task)
+    results = await asyncio.gather(*(
+        _fetch_with_retry(league, fetcher, client)
+        for league, fetcher in fetchers.items()
+    ))
 
     all_games: list[Game] = []
     for league_games in results:
         all_games.extend(league_games)
 
     all_games.sort(key=lambda g: g.start_time)
+    return all_games
+
+
+async def get_all_upcoming_games(client: httpx.AsyncClient | None = None) -> list[Game]:
+    """
+    Fetch upcoming games from all four leagues concurrently.
+    Returns a combined list sorted by start_time ascending.
+    Pass the app's shared *client* to reuse its pooled connections.
+    """
+    all_games = await _fetch_leagues({
+        "NBA": fetch_upcoming_nba_games,
+        "MLB": fetch_upcoming_mlb_games,
+        "NFL": fetch_upcoming_nfl_games,
+        "NHL": fetch_upcoming_nhl_games,
+    }, client)
 
     now_iso = datetime.now(timezone.utc).isoformat()
     logger.info("Cycle complete at %s — total upcoming games: %d", now_iso, len(all_games))
     return all_games
 
 
-async def get_all_live_games() -> list[Game]:
+async def get_all_live_games(client: httpx.AsyncClient | None = None) -> list[Game]:
     """
     Fetch currently live (in-progress) games from all four leagues concurrently.
     Returns a combined list sorted by start_time ascending.
     """
-    async with httpx.AsyncClient(timeout=None) as client:
-        nba_task = _fetch_with_retry("NBA", fetch_live_nba_games, client)
-        mlb_task = _fetch_with_retry("MLB", fetch_live_mlb_games, client)
-        nfl_task = _fetch_with_retry("NFL", fetch_live_nfl_games, client)
-        nhl_task = _fetch_with_retry("NHL", fetch_live_nhl_games, client)
-
-        results = await asyncio.gather(nba_task, mlb_task, nfl_task, nhl_task)
-
-    all_games: list[Game] = []
-    for league_games in results:
-        all_games.extend(league_games)
-
-    all_games.sort(key=lambda g: g.start_time)
+    all_games = await _fetch_leagues({
+        "NBA": fetch_live_nba_games,
+        "MLB": fetch_live_mlb_games,
+        "NFL": fetch_live_nfl_games,
+        "NHL": fetch_live_nhl_games,
+    }, client)
     logger.info("Live games total: %d", len(all_games))
     return all_games
 
 
-async def get_all_games() -> list[Game]:
+async def get_all_games(client: httpx.AsyncClient | None = None) -> list[Game]:
     """
     Fetch both upcoming (not live) and live games from all leagues.
     Returns a combined list sorted by start_time ascending; each game has live=0 or live=1.
     """
-    upcoming = await get_all_upcoming_games()
-    live = await get_all_live_games()
+    if client is None:
+        client = get_client()
+    if client is None:
+        async with create_http_client() as own_client:
+            return await get_all_games(own_client)
+
+    # The league fetchers only share the client, so both halves (eight
+    # requests in all) can be in flight on the same pool at once
+    upcoming, live = await asyncio.gather(
+        get_all_upcoming_games(client), get_all_live_games(client)
+    )
     all_games = upcoming + live
     all_games.sort(key=lambda g: g.start_time)
     logger.info("All games (upcoming + live): %d", len(all_games))
@@ -0,0 +1,78 @@
+"""
+Shared outbound HTTP client.
+
+One pooled ``httpx.AsyncClient`` is opened by the FastAPI lifespan and
+reused by every outbound call made on the app's event loop, so keep-alive
+connections (and their TLS sessions) to the league APIs survive between
+requests instead of being re-established per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+import httpx
+
+from app.services._json import loads
+
+
+def read_json(resp: httpx.Response) -> Any:
+    """Decode *resp*'s JSON body (with orjson when available)."""
+    return loads(resp.content)
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a pooled HTTP/2 client with the app's timeouts and limits.
+
+    Compression is negotiated by httpx itself: its default Accept-Encoding
+    lists every decoder installed (gzip and deflate always, ``br`` with the
+    ``brotli`` extra), so the header never advertises an encoding the
+    client can't decode.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0),
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        http2=True,
+    )
+
+
+def open_shared_client() -> httpx.AsyncClient:
+    """Create the shared client on the running event loop and return it.
+
+    Called once at app startup; pair with :func:`close_shared_client`.
+    """
+    global _client, _client_loop
+    _client = create_http_client()
+    _client_loop = asyncio.get_running_loop()
+    return _client
+
+
+async def close_shared_client() -> None:
+    """Close the shared client at app shutdown."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+def get_client() -> Optional[httpx.AsyncClient]:
+    """Return the shared client, or None if it can't be used here.
+
+    An ``AsyncClient``'s connections belong to the loop that opened them,
+    so the client is only handed out on that loop. Callers on other loops
+    (background refresh threads, sync wrappers) get None and should use a
+    client scoped to their own call.
+    """
+    client = _client
+    if client is None or client.is_closed:
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return client if loop is _client_loop else None
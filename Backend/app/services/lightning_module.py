@@ -0,0 +1,82 @@
+"""
+PyTorch Lightning training wrapper for TemporalArbitrageScorer.
+
+Only needed for training and for the notebook's checkpoint format;
+inference loads the checkpoint's weights straight into the bare scorer
+(see ``LocalModelService``) and never imports Lightning.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pytorch_lightning as pl
+import torch
+import torch.nn as nn
+
+from app.services.local_model_service import TemporalArbitrageScorer
+
+
+class ArbitrageLightningModule(pl.LightningModule):
+    """PyTorch Lightning wrapper for TemporalArbitrageScorer."""
+
+    def __init__(
+        self,
+        n_input_features: int = 10,
+        d_model: int = 64,
+        n_heads: int = 4,
+        n_layers: int = 3,
+        d_ff: int = 256,
+        dropout: float = 0.1,
+        learning_rate: float = 1e-3,
+        weight_decay: float = 1e-5,
+        cross_attn_start_layer: int = 1,
+    ):
+        super().__init__()
+        self.save_hyperparameters()
+
+        self.model = TemporalArbitrageScorer(
+            n_input_features=n_input_features,
+            d_model=d_model,
+            n_heads=n_heads,
+            n_layers=n_layers,
+            d_ff=d_ff,
+            dropout=dropout,
+            cross_attn_start_layer=cross_attn_start_layer,
+        )
+        self.loss_fn = nn.BCELoss()
+
+    def forward(self, features, mask, market_type):
+        return self.model(features, mask, market_type)
+
+    def _shared_step(self, batch, stage: str):
+        scores = self(batch["features"], batch["mask"], batch["market_type"])
+        loss = self.loss_fn(scores, batch["label"])
+        preds = (scores > 0.5).float()
+        acc = (preds == batch["label"]).float().mean()
+        self.log(f"{stage}_loss", loss, prog_bar=True, batch_size=len(batch["label"]))
+        self.log(f"{stage}_acc", acc, prog_bar=True, batch_size=len(batch["label"]))
+        return loss
+
+    def training_step(self, batch, batch_idx):
+        return self._shared_step(batch, "train")
+
+    def validation_step(self, batch, batch_idx):
+        return self._shared_step(batch, "val")
+
+    def test_step(self, batch, batch_idx):
+        return self._shared_step(batch, "test")
+
+    def configure_optimizers(self):
+        optimizer = torch.optim.AdamW(
+            self.parameters(),
+            lr=self.hparams.learning_rate,
+            weight_decay=self.hparams.weight_decay,
+        )
+        scheduler = torch.optim.lr_scheduler.CosineAnnealingWarmRestarts(
+            optimizer, T_0=10, T_mult=2
+        )
+        return {"optimizer": optimizer, "lr_scheduler": scheduler}
+
+    def get_params(self) -> Dict[str, Any]:
+        return self.model.get_params()
@@ -13,7 +13,6 @@ import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-import pytorch_lightning as pl
 
 from app.models.prediction import PredictionRequest
 
@@ -23,9 +22,20 @@ logger = logging.getLogger(__name__)
 MARKET_TYPE_MAP = {"MONEYLINE": 0, "POINTS_SPREAD": 1, "POINTS_TOTAL": 2}
 
 
+def __getattr__(name: str) -> Any:
+    # The Lightning wrapper used to live here; import it (and Lightning)
+    # only for callers that still ask for it
+    if name == "ArbitrageLightningModule":
+        from app.services.lightning_module import ArbitrageLightningModule
+
+        return ArbitrageLightningModule
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # ══════════════════════════════════════════════════════════════════════
 # Model classes — copied verbatim from the training notebook so that
-# `load_from_checkpoint` can reconstruct the architecture.
+# checkpoint weights load into the same architecture. The Lightning
+# training wrapper lives in app.services.lightning_module.
 # ══════════════════════════════════════════════════════════════════════
 
 class ALiBiAttention(nn.Module):
@@ -45,8 +55,15 @@ class ALiBiAttention(nn.Module):
         self.out_proj = nn.Linear(d_model, d_model)
         self.dropout = nn.Dropout(dropout)
 
+        # Derived from n_heads alone, so there's no need to checkpoint it
         slopes = self._compute_slopes(n_heads)
-        self.register_buffer("slopes", slopes)
+        self.register_buffer("slopes", slopes, persistent=False)
+        # Inference-only: ALiBi bias per (T, device, dtype). Not a buffer,
+        # so checkpoints are unaffected.
+        self._alibi_cache: Dict[tuple, torch.Tensor] = {}
+        # Inference-only: v_proj and out_proj composed into one linear for
+        # the length-1 path, tagged with the parameter versions it came from
+        self._vo_cache: Optional[tuple] = None
 
     @staticmethod
     def _compute_slopes(n_heads: int) -> torch.Tensor:
@@ -65,13 +82,40 @@ class ALiBiAttention(nn.Module):
             ]
             return torch.tensor(slopes + extra, dtype=torch.float32)
 
+    def _fused_value_out(self) -> tuple[torch.Tensor, torch.Tensor]:
+        """Weight and bias of ``out_proj(v_proj(x))`` as a single linear.
+
+        The two projections stay the source of truth (so checkpoints keep
+        their layout); the composed copy is rebuilt whenever either is
+        moved, cast or updated in place.
+        """
+        params = (self.v_proj.weight, self.v_proj.bias,
+                  self.out_proj.weight, self.out_proj.bias)
+        tag = tuple((p.data_ptr(), p._version) for p in params)
+        if self._vo_cache is None or self._vo_cache[0] != tag:
+            w_v, b_v, w_o, b_o = params
+            self._vo_cache = (tag, w_o @ w_v, w_o @ b_v + b_o)
+        return self._vo_cache[1], self._vo_cache[2]
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Older checkpoints still carry the slopes; they're recomputed in
+        # __init__, so drop the saved copy rather than reject the key
+        state_dict.pop(prefix + "slopes", None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+
     def _alibi_bias(self, T: int) -> torch.Tensor:
+        key = (T, self.slopes.device, self.slopes.dtype)
+        bias = self._alibi_cache.get(key)
+        if bias is not None and not self.training:
+            return bias
         positions = torch.arange(T, device=self.slopes.device)
         distance = positions.unsqueeze(0) - positions.unsqueeze(1)
         bias = (
             self.slopes.unsqueeze(-1).unsqueeze(-1)
             * distance.unsqueeze(0).abs().neg()
         )
+        if not self.training:
+            self._alibi_cache[key] = bias
         return bias
 
     def forward(
@@ -84,23 +128,37 @@ class ALiBiAttention(nn.Module):
         B, T_q, _ = query.shape
         T_k = key.shape[1]
 
+        if T_q == 1 and T_k == 1 and mask is None and not self.training:
+            # Softmax over a single unmasked key is exactly 1, so attention
+            # reduces to the projected value; skip Q/K, ALiBi and softmax,
+            # and apply the value and output projections as one GEMM
+            weight, bias = self._fused_value_out()
+            return F.linear(value, weight, bias)
+
         Q = self.q_proj(query).view(B, T_q, self.n_heads, self.head_dim).transpose(1, 2)
         K = self.k_proj(key).view(B, T_k, self.n_heads, self.head_dim).transpose(1, 2)
         V = self.v_proj(value).view(B, T_k, self.n_heads, self.head_dim).transpose(1, 2)
 
-        attn = (Q @ K.transpose(-2, -1)) * self.scale
-
+        # ALiBi bias and key-padding mask folded into one additive (or
+        # boolean) attn_mask, so SDPA can run the whole softmax(QK^T)V fused
+        attn_mask: Optional[torch.Tensor] = None
         if T_q == T_k:
-            attn = attn + self._alibi_bias(T_q).unsqueeze(0)
+            attn_mask = self._alibi_bias(T_q).unsqueeze(0)
 
         if mask is not None:
             mask_expanded = mask.unsqueeze(1).unsqueeze(2)
-            attn = attn.masked_fill(~mask_expanded, float("-inf"))
-
-        attn = F.softmax(attn, dim=-1)
-        attn = self.dropout(attn)
-
-        out = (attn @ V).transpose(1, 2).contiguous().view(B, T_q, self.d_model)
+            if attn_mask is None:
+                attn_mask = mask_expanded
+            else:
+                attn_mask = attn_mask.masked_fill(~mask_expanded, float("-inf"))
+
+        out = F.scaled_dot_product_attention(
+            Q, K, V,
+            attn_mask=attn_mask,
+            dropout_p=self.dropout.p if self.training else 0.0,
+            scale=self.scale,
+        )
+        out = out.transpose(1, 2).contiguous().view(B, T_q, self.d_model)
         return self.out_proj(out)
 
 
@@ -238,12 +296,135 @@ class TemporalArbitrageScorer(nn.Module):
             nn.Linear(d_ff // 2, 1),
         )
 
+        # Inference-only: both towers' weights stacked per depth plus the
+        # split head, tagged with the parameter versions they were built from
+        self._snapshot_cache: Optional[tuple] = None
+        self._snapshot_params: Optional[List[nn.Parameter]] = None
+
+    def _snapshot_weights(self) -> tuple[List[Dict[str, Any]], tuple]:
+        """Weights for :meth:`_forward_snapshot`, rebuilt when any parameter changes.
+
+        Returns ``(towers, head)`` from :meth:`_stacked_towers` and
+        :meth:`_split_head`.
+        """
+        if self._snapshot_params is None:
+            # Module structure is fixed, so walk it once
+            self._snapshot_params = (
+                list(self.layers_a.parameters())
+                + list(self.layers_b.parameters())
+                + [self.head[0].weight, self.head[0].bias, self.market_emb.weight]
+            )
+        tag = tuple((p.data_ptr(), p._version) for p in self._snapshot_params)
+        if self._snapshot_cache is not None and self._snapshot_cache[0] == tag:
+            return self._snapshot_cache[1]
+        weights = (self._stacked_towers(), self._split_head())
+        self._snapshot_cache = (tag, weights)
+        return weights
+
+    def _split_head(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """The head's first Linear split by its three concatenated inputs.
+
+        Returns ``(w_a, w_b, market_table)``: a (d_model, d_ff) weight per
+        pooled stream, and a (n_market_types, d_ff) table holding each
+        market embedding's contribution plus the bias. The first head
+        layer then needs no concatenation and no embedding lookup matmul.
+        """
+        d = self.d_model
+        first = self.head[0]
+        w = first.weight
+        return (
+            w[:, :d].t().contiguous(),
+            w[:, d:2 * d].t().contiguous(),
+            F.linear(self.market_emb.weight, w[:, 2 * d:], first.bias),
+        )
+
+    def _stacked_towers(self) -> List[Dict[str, Any]]:
+        """Per-depth weights of layers_a/layers_b stacked along a leading dim of 2.
+
+        Only the pieces the length-1 path uses are kept: the composed
+        value/output projections (query, key and norm_cross drop out when
+        attending to a single unmasked step), both LayerNorms and the FFN.
+        """
+
+        def _linear(w_a, b_a, w_b, b_b):
+            # (2, in, out) weight and (2, 1, out) bias for baddbmm
+            return (torch.stack([w_a.t(), w_b.t()]),
+                    torch.stack([b_a, b_b]).unsqueeze(1))
+
+        def _norm(n_a, n_b):
+            return (torch.stack([n_a.weight, n_b.weight]).unsqueeze(1),
+                    torch.stack([n_a.bias, n_b.bias]).unsqueeze(1), n_a.eps)
+
+        stacked = []
+        for la, lb in zip(self.layers_a, self.layers_b):
+            depth = {
+                "norm1": _norm(la.norm1, lb.norm1),
+                "self_vo": _linear(*la.self_attn._fused_value_out(),
+                                   *lb.self_attn._fused_value_out()),
+                "norm2": _norm(la.norm2, lb.norm2),
+                "ffn1": _linear(la.ffn[0].weight, la.ffn[0].bias,
+                                lb.ffn[0].weight, lb.ffn[0].bias),
+                "ffn2": _linear(la.ffn[3].weight, la.ffn[3].bias,
+                                lb.ffn[3].weight, lb.ffn[3].bias),
+                "cross_vo": None,
+            }
+            if la.use_cross_attn:
+                depth["cross_vo"] = _linear(*la.cross_attn._fused_value_out(),
+                                            *lb.cross_attn._fused_value_out())
+            stacked.append(depth)
+
+        return stacked
+
+    def _forward_snapshot(
+        self, features: torch.Tensor, market_type: torch.Tensor
+    ) -> torch.Tensor:
+        """Inference for unmasked length-1 sequences, both towers at once.
+
+        Stream A and B run the same layer structure on the same input, so
+        their hidden states are stacked as (2, B, d_model) and every layer
+        becomes one batched matmul per projection instead of two.
+        """
+        towers, (head_a, head_b, market_table) = self._snapshot_weights()
+        h = torch.stack([self.proj_a(features[:, 0]), self.proj_b(features[:, 0])])
+
+        for depth in towers:
+            # Each stream cross-attends to the other's previous state
+            other = h.flip(0)
+
+            gamma, beta, eps = depth["norm1"]
+            x = F.layer_norm(h, h.shape[-1:], eps=eps) * gamma + beta
+            w, b = depth["self_vo"]
+            h_new = h + torch.baddbmm(b, x, w)
+
+            if depth["cross_vo"] is not None:
+                w, b = depth["cross_vo"]
+                h_new = h_new + torch.baddbmm(b, other, w)
+
+            gamma, beta, eps = depth["norm2"]
+            x = F.layer_norm(h_new, h_new.shape[-1:], eps=eps) * gamma + beta
+            w1, b1 = depth["ffn1"]
+            w2, b2 = depth["ffn2"]
+            h = h_new + torch.baddbmm(b2, F.gelu(torch.baddbmm(b1, x, w1)), w2)
+
+        # Attention pooling over a single step is the identity. The head's
+        # first layer is applied per input block, so [h_a, h_b, m_emb] is
+        # never concatenated; dropout is a no-op at inference.
+        x = torch.addmm(market_table[market_type], h[0], head_a).addmm_(h[1], head_b)
+        x = F.gelu(self.head[3](F.gelu(x)))
+        return torch.sigmoid(self.head[6](x).squeeze(-1))
+
     def forward(
         self,
         features: torch.Tensor,
         mask: torch.Tensor,
         market_type: torch.Tensor,
     ) -> torch.Tensor:
+        if not self.training and bool(mask.all()):
+            # Nothing is masked out, so the masked_fill calls would be no-ops
+            mask = None
+            if features.shape[1] == 1:
+                return self._forward_snapshot(features, market_type)
+
         h_a = self.proj_a(features)
         h_b = self.proj_b(features)
 
@@ -272,71 +453,6 @@ class TemporalArbitrageScorer(nn.Module):
         }
 
 
-class ArbitrageLightningModule(pl.LightningModule):
-    """PyTorch Lightning wrapper for TemporalArbitrageScorer."""
-
-    def __init__(
-        self,
-        n_input_features: int = 10,
-        d_model: int = 64,
-        n_heads: int = 4,
-        n_layers: int = 3,
-        d_ff: int = 256,
-        dropout: float = 0.1,
-        learning_rate: float = 1e-3,
-        weight_decay: float = 1e-5,
-        cross_attn_start_layer: int = 1,
-    ):
-        super().__init__()
-        self.save_hyperparameters()
-
-        self.model = TemporalArbitrageScorer(
-            n_input_features=n_input_features,
-            d_model=d_model,
-            n_heads=n_heads,
-            n_layers=n_layers,
-            d_ff=d_ff,
-            dropout=dropout,
-            cross_attn_start_layer=cross_attn_start_layer,
-        )
-        self.loss_fn = nn.BCELoss()
-
-    def forward(self, features, mask, market_type):
-        return self.model(features, mask, market_type)
-
-    def _shared_step(self, batch, stage: str):
-        scores = self(batch["features"], batch["mask"], batch["market_type"])
-        loss = self.loss_fn(scores, batch["label"])
-        preds = (scores > 0.5).float()
-        acc = (preds == batch["label"]).float().mean()
-        self.log(f"{stage}_loss", loss, prog_bar=True, batch_size=len(batch["label"]))
-        self.log(f"{stage}_acc", acc, prog_bar=True, batch_size=len(batch["label"]))
-        return loss
-
-    def training_step(self, batch, batch_idx):
-        return self._shared_step(batch, "train")
-
-    def validation_step(self, batch, batch_idx):
-        return self._shared_step(batch, "val")
-
-    def test_step(self, batch, batch_idx):
-        return self._shared_step(batch, "test")
-
-    def configure_optimizers(self):
-        optimizer = torch.optim.AdamW(
-            self.parameters(),
-            lr=self.hparams.learning_rate,
-            weight_decay=self.hparams.weight_decay,
-        )
-        scheduler = torch.optim.lr_scheduler.CosineAnnealingWarmRestarts(
-            optimizer, T_0=10, T_mult=2
-        )
-        return {"optimizer": optimizer, "lr_scheduler": scheduler}
-
-    def get_params(self) -> Dict[str, Any]:
-        return self.model.get_params()
-
-
 # ══════════════════════════════════════════════════════════════════════
 # Feature engineering — mirrors notebook cell 9
 # ══════════════════════════════════════════════════════════════════════
@@ -344,59 +460,129 @@ class ArbitrageLightningModule(pl.LightningModule):
 def engineer_features(odds_a: np.ndarray, odds_b: np.ndarray) -> np.ndarray:
     """Convert a pair of odds sequences into a (T, 10) feature matrix.
 
-    All values are float64 to match the trained model's expected dtype.
+    Features are computed in float64 and returned as float32, the dtype
+    the model is served in.
     """
     odds_a = np.asarray(odds_a, dtype=np.float64)
     odds_b = np.asarray(odds_b, dtype=np.float64)
     T = len(odds_a)
 
-    impl_a = 1.0 / odds_a
-    impl_b = 1.0 / odds_b
-
-    arb_indicator = impl_a + impl_b
-    spread = odds_a - odds_b
-    impl_diff = impl_a - impl_b
-
-    delta_a = np.concatenate([[0.0], np.diff(odds_a)])
-    delta_b = np.concatenate([[0.0], np.diff(odds_b)])
-
-    rel_delta_a = delta_a / (odds_a + 1e-8)
-    rel_delta_b = delta_b / (odds_b + 1e-8)
-
-    time_pos = np.linspace(0.0, 1.0, T)
-
-    features = np.stack(
-        [
-            odds_a,
-            odds_b,
-            spread,
-            impl_diff,
-            arb_indicator,
-            delta_a,
-            delta_b,
-            rel_delta_a,
-            rel_delta_b,
-            time_pos,
-        ],
-        axis=1,
-    )
-    return features  # (T, 10), float64
+    # Columns: odds_a, odds_b, spread, impl_diff, arb_indicator,
+    # delta_a, delta_b, rel_delta_a, rel_delta_b, time_pos.
+    # Each is written straight into a C-contiguous buffer, so the result
+    # can go to torch.from_numpy without another copy.
+    out = np.empty((T, 10), dtype=np.float32)
+    out[:, 0] = odds_a
+    out[:, 1] = odds_b
+    np.subtract(odds_a, odds_b, out=out[:, 2])
+
+    impl_a = np.reciprocal(odds_a)
+    impl_b = np.reciprocal(odds_b)
+    np.subtract(impl_a, impl_b, out=out[:, 3])
+    np.add(impl_a, impl_b, out=out[:, 4])
+
+    out[0, 5:9] = 0.0
+    if T > 1:
+        delta_a = odds_a[1:] - odds_a[:-1]
+        delta_b = odds_b[1:] - odds_b[:-1]
+        out[1:, 5] = delta_a
+        out[1:, 6] = delta_b
+        np.divide(delta_a, odds_a[1:] + 1e-8, out=out[1:, 7])
+        np.divide(delta_b, odds_b[1:] + 1e-8, out=out[1:, 8])
+
+    out[:, 9] = np.linspace(0.0, 1.0, T)
+    return out  # (T, 10), float32
+
+
+def engineer_snapshot_features(odds_a: np.ndarray, odds_b: np.ndarray) -> np.ndarray:
+    """Build features for B independent single-snapshot pairs at once.
+
+    Equivalent to stacking ``engineer_features([a], [b])`` for each pair
+    into a (B, 1, 10) array: with one timestep the deltas, relative deltas
+    and time position are all zero.
+    """
+    odds_a = np.asarray(odds_a, dtype=np.float64)
+    odds_b = np.asarray(odds_b, dtype=np.float64)
+
+    out = np.zeros((len(odds_a), 1, 10), dtype=np.float32)
+    cols = out[:, 0, :]
+    cols[:, 0] = odds_a
+    cols[:, 1] = odds_b
+    np.subtract(odds_a, odds_b, out=cols[:, 2])
+    impl_a = np.reciprocal(odds_a)
+    impl_b = np.reciprocal(odds_b)
+    np.subtract(impl_a, impl_b, out=cols[:, 3])
+    np.add(impl_a, impl_b, out=cols[:, 4])
+    return out  # (B, 1, 10), float32
 
 
 # ══════════════════════════════════════════════════════════════════════
 # Service class
 # ══════════════════════════════════════════════════════════════════════
 
+def _configure_threads(num_threads: int) -> None:
+    """Cap torch's CPU thread pools for this process.
+
+    The model is tiny, so on many-core hosts the intra-op sync cost of a
+    wide pool outweighs the parallel gain, and co-located workers contend
+    for cores. Inference runs one forward at a time, so inter-op
+    parallelism is disabled outright.
+    """
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first parallel op in the process
+        logger.debug("Inter-op thread count already fixed; leaving it")
+    logger.info(
+        "Torch threads: intra-op=%d inter-op=%d",
+        torch.get_num_threads(), torch.get_num_interop_threads(),
+    )
+
+
+# Mask for a single fully-visible timestep. Inference never writes to the
+# mask, so one shared tensor serves every single-request call.
+_MASK_T = torch.ones(1, 1, dtype=torch.bool)
+
+
 class LocalModelService:
     """Loads a trained .ckpt and exposes prediction helpers."""
 
-    def __init__(self, checkpoint_path: str):
+    def __init__(self, checkpoint_path: str, num_threads: Optional[int] = None):
+        if num_threads:
+            _configure_threads(num_threads)
         logger.info("Loading model checkpoint from %s", checkpoint_path)
-        self._module = ArbitrageLightningModule.load_from_checkpoint(
-            checkpoint_path, map_location="cpu"
+        self._module = self._load_scorer(checkpoint_path)
+        # A length-1 sequence never needs double precision; float32 halves
+        # memory traffic and uses the faster BLAS kernels
+        self._module.float().eval()
+        logger.info("Model loaded and set to eval mode (float32)")
+
+    @staticmethod
+    def _load_scorer(checkpoint_path: str) -> TemporalArbitrageScorer:
+        """Load a Lightning checkpoint's weights into a bare scorer.
+
+        Only the hyperparameters and the ``model.`` weights are read, so
+        inference needs neither Lightning nor its trainer state. Dropout
+        is built at 0.0 since it never applies at inference.
+        """
+        ckpt = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
+        hp = ckpt["hyper_parameters"]
+        model = TemporalArbitrageScorer(
+            n_input_features=hp["n_input_features"],
+            d_model=hp["d_model"],
+            n_heads=hp["n_heads"],
+            n_layers=hp["n_layers"],
+            d_ff=hp["d_ff"],
+            dropout=0.0,
+            cross_attn_start_layer=hp["cross_attn_start_layer"],
         )
-        self._module.double().eval()
-        logger.info("Model loaded and set to eval mode (float64)")
+        model.load_state_dict({
+            key.removeprefix("model."): value
+            for key, value in ckpt["state_dict"].items()
+            if key.startswith("model.")
+        })
+        return model
 
     # ── low-level predict ─────────────────────────────────────────────
     def predict(
@@ -405,17 +591,30 @@ class LocalModelService:
         mask: torch.Tensor,
         market_type: torch.Tensor,
     ) -> torch.Tensor:
-        """Run a forward pass with no gradient tracking.
+        """Run a forward pass in inference mode.
 
         Args:
-            features:    (B, T, 10) float64
+            features:    (B, T, 10) float32 (other float dtypes are cast)
             mask:        (B, T) bool
             market_type: (B,) long
         Returns:
             (B,) scores in [0, 1]
         """
-        with torch.no_grad():
-            return self._module(features, mask, market_type)
+        with torch.inference_mode():
+            return self._module(features.to(torch.float32), mask, market_type)
+
+    def predict_batch(
+        self,
+        features: torch.Tensor,
+        mask: torch.Tensor,
+        market_type: torch.Tensor,
+    ) -> list[float]:
+        """Score a pre-stacked batch in a single forward pass.
+
+        Takes the same tensors as :meth:`predict` and returns one score
+        per batch row as plain floats.
+        """
+        return self.predict(features, mask, market_type).tolist()
 
     # ── high-level: PredictionRequest → score dict ────────────────────
     def predict_from_request(self, req: PredictionRequest) -> dict:
@@ -427,9 +626,24 @@ class LocalModelService:
         time series (single snapshot).  For a richer signal, callers can
         later supply full historical sequences.
         """
+        market_str = (req.market_type or "MONEYLINE").upper()
+        return self.predict_markets_from_request(req, [market_str])[0]
+
+    def predict_markets_from_request(
+        self, req: PredictionRequest, market_types: List[str]
+    ) -> List[dict]:
+        """Score one request under several market types in a single pass.
+
+        The features depend only on the odds, so they are engineered once
+        and shared by every batch row; only the market index differs.
+        Returns one :meth:`predict_from_request`-style dict per market type.
+        """
         bookmakers = list(req.current_odds.keys())
         if len(bookmakers) < 2:
-            return {"score": None, "error": "Need at least 2 bookmakers"}
+            return [
+                {"score": None, "error": "Need at least 2 bookmakers"}
+                for _ in market_types
+            ]
 
         # Use first two bookmakers as the two sides
         odds_a_raw = np.array(req.current_odds[bookmakers[0]], dtype=np.float64)
@@ -445,18 +659,23 @@ class LocalModelService:
 
         features = engineer_features(odds_a_seq, odds_b_seq)  # (1, 10)
 
-        # Tensors — batch size 1
-        features_t = torch.tensor(features, dtype=torch.float64).unsqueeze(0)  # (1,1,10)
-        mask_t = torch.ones(1, 1, dtype=torch.bool)  # (1, 1)
-
-        market_str = (req.market_type or "MONEYLINE").upper()
-        market_idx = MARKET_TYPE_MAP.get(market_str, 0)
-        market_t = torch.tensor([market_idx], dtype=torch.long)  # (1,)
-
-        score = self.predict(features_t, mask_t, market_t)
-
-        return {
-            "score": float(score.item()),
-            "market_type": market_str,
-            "bookmakers_used": bookmakers[:2],
-        }
+        # Tensors — one row per market type, all viewing the same features
+        # from_numpy aliases the float32 buffer; expand adds no copy
+        n = len(market_types)
+        features_t = torch.from_numpy(features).unsqueeze_(0).expand(n, 1, 10)
+
+        market_strs = [mt.upper() for mt in market_types]
+        market_t = torch.from_numpy(np.fromiter(
+            (MARKET_TYPE_MAP.get(m, 0) for m in market_strs), dtype=np.int64, count=n
+        ))  # (n,)
+
+        scores = self.predict_batch(features_t, _MASK_T.expand(n, 1), market_t)
+
+        return [
+            {
+                "score": score,
+                "market_type": market_str,
+                "bookmakers_used": bookmakers[:2],
+            }
+            for score, market_str in zip(scores, market_strs)
+        ]
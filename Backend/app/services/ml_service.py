@@ -11,8 +11,15 @@ Pipeline:
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import copy
 import logging
-from typing import Any
+import threading
+import time
+from operator import attrgetter
+from typing import Any, Optional
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -59,23 +66,30 @@ SAMPLE_PAYLOAD = {
 }
 
 
+def _sample_payloads() -> list[dict[str, Any]]:
+    """Fresh copy of the sample fallback for callers that may store or mutate it."""
+    return [copy.deepcopy(SAMPLE_PAYLOAD)]
+
+
 # ---------------------------------------------------------------------------
 # Convert game_prediction_service output → PredictionInput dicts
 # ---------------------------------------------------------------------------
 
+_MARKET_KEYS = (
+    "market_type",
+    "confidence",
+    "bookmaker_1",
+    "bookmaker_2",
+    "price_1",
+    "price_2",
+    "prediction",
+)
+_market_fields = attrgetter(*_MARKET_KEYS)
+
+
 def _game_prediction_to_payload(game_resp) -> dict[str, Any]:
     """Convert a GamePredictionResponse into a PredictionInput-compatible dict."""
-    markets = []
-    for m in game_resp.markets:
-        markets.append({
-            "market_type": m.market_type,
-            "confidence": m.confidence,
-            "bookmaker_1": m.bookmaker_1,
-            "bookmaker_2": m.bookmaker_2,
-            "price_1": m.price_1,
-            "price_2": m.price_2,
-            "prediction": m.prediction,
-        })
+    markets = [dict(zip(_MARKET_KEYS, _market_fields(m))) for m in game_resp.markets]
 
     return {
         "category": game_resp.category,  # Use actual category from game response
@@ -98,43 +112,123 @@ def _fetch_all_predictions_sync() -> list[dict[str, Any]]:
         if game_resp.markets:
             payloads.append(_game_prediction_to_payload(game_resp))
 
-    logger.info("Fetched predictions across all sports: %d total games", len(payloads))
+    if payloads and logger.isEnabledFor(logging.INFO):
+        logger.info("Fetched predictions across all sports: %d total games", len(payloads))
 
-    # Log category breakdown
-    categories = {}
-    for payload in payloads:
-        cat = payload.get("category", "unknown")
-        categories[cat] = categories.get(cat, 0) + 1
-    logger.info("Category breakdown: %s", categories)
+        # Log category breakdown
+        categories: dict[str, int] = {}
+        for payload in payloads:
+            cat = payload.get("category", "unknown")
+            categories[cat] = categories.get(cat, 0) + 1
+        logger.info("Category breakdown: %s", categories)
 
     return payloads
 
 
-async def fetch_all_predictions() -> list[dict[str, Any]]:
-    """
-    Full ML pipeline:
-      1. Fetch upcoming games + odds (Delta Lake / sample fallback)
-      2. Run local model inference for each game × market type
-      3. Return list of PredictionInput-compatible dicts
+# ---------------------------------------------------------------------------
+# Prediction cache
+# ---------------------------------------------------------------------------
+# The whole-slate payloads are reused for settings.ml_cache_ttl_seconds, so
+# back-to-back requests don't rerun the pipeline. While a run is in flight,
+# other callers await it instead of starting their own; a concurrent.futures
+# Future is used because callers may be on different event loops.
+
+_predictions_cache: Optional[tuple[float, list[dict[str, Any]]]] = None
+_predictions_loading: concurrent.futures.Future | None = None
+_predictions_lock = threading.Lock()
+# misses start a pipeline run; shared calls wait on one already in flight
+_predictions_stats = {"hits": 0, "misses": 0, "shared": 0}
+
+
+def _cached_predictions() -> Optional[list[dict[str, Any]]]:
+    """Return the live cached payloads, or None if missing/expired."""
+    cached = _predictions_cache
+    if cached is None or cached[0] <= time.monotonic():
+        return None
+    return cached[1]
+
+
+def _copy_payloads(payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Copy payloads and their market dicts so callers can't mutate the cache."""
+    return [
+        {**payload, "markets": [dict(m) for m in payload["markets"]]}
+        for payload in payloads
+    ]
+
+
+def cache_stats() -> dict[str, int]:
+    """Return prediction-cache ``hits``, ``misses`` and ``shared`` waits so far."""
+    with _predictions_lock:
+        return dict(_predictions_stats)
+
+
+def invalidate_predictions() -> None:
+    """Drop the cached payloads so the next call reruns the pipeline."""
+    global _predictions_cache
+    _predictions_cache = None
+
+
+async def _run_pipeline() -> list[dict[str, Any]]:
+    """Run the pipeline once, caching real (non-sample) results."""
+    global _predictions_cache
 
-    Falls back to [SAMPLE_PAYLOAD] on error.
-    """
     try:
         payloads = await asyncio.to_thread(_fetch_all_predictions_sync)
         if not payloads:
             logger.info("No game predictions produced — returning sample payload.")
-            return [SAMPLE_PAYLOAD]
+            return _sample_payloads()
         logger.info("Local model produced predictions for %d games.", len(payloads))
+        if settings.ml_cache_ttl_seconds > 0:
+            _predictions_cache = (
+                time.monotonic() + settings.ml_cache_ttl_seconds, payloads
+            )
         return payloads
     except Exception as e:
         logger.error("Local model pipeline failed (%s) — falling back to sample.", e)
-        return [SAMPLE_PAYLOAD]
+        return _sample_payloads()
+
+
+async def fetch_all_predictions() -> list[dict[str, Any]]:
+    """
+    Full ML pipeline:
+      1. Fetch upcoming games + odds (Delta Lake / sample fallback)
+      2. Run local model inference for each game × market type
+      3. Return list of PredictionInput-compatible dicts
+
+    Results are cached briefly (see ``settings.ml_cache_ttl_seconds``);
+    every caller gets its own copy, so it may store or mutate them.
+    Falls back to [SAMPLE_PAYLOAD] on error; fallbacks are not cached.
+    """
+    global _predictions_loading
+
+    with _predictions_lock:
+        cached = _cached_predictions()
+        if cached is not None:
+            _predictions_stats["hits"] += 1
+            return _copy_payloads(cached)
+        loading = _predictions_loading
+        if loading is None:
+            _predictions_stats["misses"] += 1
+            _predictions_loading = concurrent.futures.Future()
+        else:
+            _predictions_stats["shared"] += 1
+    if loading is not None:
+        return _copy_payloads(await asyncio.wrap_future(loading))
+
+    payloads: list[dict[str, Any]] = _sample_payloads()
+    try:
+        payloads = await _run_pipeline()
+        return _copy_payloads(payloads)
+    finally:
+        with _predictions_lock:
+            done, _predictions_loading = _predictions_loading, None
+        done.set_result(payloads)
 
 
-async def fetch_prediction() -> dict:
+async def fetch_prediction() -> dict[str, Any]:
     """
     Backward-compatible: return a single prediction payload dict.
     Used by GET /arbitrage/opportunities and GET /arbitrage/analysis.
     """
     payloads = await fetch_all_predictions()
-    return payloads[0] if payloads else SAMPLE_PAYLOAD
+    return payloads[0]
@@ -6,17 +6,24 @@ Only games with abstractGameState == "Preview" (not yet started) are returned.
 """
 
 import logging
-from datetime import datetime, timezone, timedelta
 
 import httpx
 
 from app.config import settings
 from app.models.game import Game
+from app.services._schedule import utc_date_window
+from app.services.http_client import read_json
 
 logger = logging.getLogger(__name__)
 
 _BASE = "https://statsapi.mlb.com/api/v1/schedule"
 _CATEGORY = "baseball"
+# Response fields requested from the schedule endpoint
+_FIELDS = (
+    "dates,date,games,gamePk,gameDate,"
+    "status,abstractGameState,"
+    "teams,home,away,team,name,abbreviation"
+)
 
 # MLB Stats API returns full team names, but we keep a map for any abbreviation fallback
 _TEAM_MAP: dict[str, str] = {
@@ -54,13 +61,16 @@ _TEAM_MAP: dict[str, str] = {
 
 
 def _normalize(abbr: str, full_name: str) -> str:
-    return _TEAM_MAP.get(abbr.upper(), full_name)
+    # Keys are upper-case and the APIs already send upper-case
+    # abbreviations, so only re-case on a miss
+    name = _TEAM_MAP.get(abbr)
+    if name is None:
+        name = _TEAM_MAP.get(abbr.upper(), full_name)
+    return name
 
 
 async def fetch_upcoming_mlb_games(client: httpx.AsyncClient) -> list[Game]:
-    now = datetime.now(timezone.utc)
-    start_date = now.strftime("%Y-%m-%d")
-    end_date = (now + timedelta(days=settings.days_ahead)).strftime("%Y-%m-%d")
+    start_date, end_date = utc_date_window("%Y-%m-%d", settings.days_ahead)
 
     resp = await client.get(
         _BASE,
@@ -69,15 +79,11 @@ async def fetch_upcoming_mlb_games(client: httpx.AsyncClient) -> list[Game]:
             "startDate": start_date,
             "endDate": end_date,
             "gameType": "R",          # Regular season; add "S" for spring training
-            "fields": (
-                "dates,date,games,gamePk,gameDate,"
-                "status,abstractGameState,"
-                "teams,home,away,team,name,abbreviation"
-            ),
+            "fields": _FIELDS,
         },
     )
     resp.raise_for_status()
-    data = resp.json()
+    data = read_json(resp)
 
     games: list[Game] = []
     for date_entry in data.get("dates", []):
@@ -108,9 +114,7 @@ async def fetch_upcoming_mlb_games(client: httpx.AsyncClient) -> list[Game]:
 
 async def fetch_live_mlb_games(client: httpx.AsyncClient) -> list[Game]:
     """Fetch only live (in-progress) MLB games. Same schedule API, filter abstractGameState Live."""
-    now = datetime.now(timezone.utc)
-    start_date = now.strftime("%Y-%m-%d")
-    end_date = start_date
+    start_date, end_date = utc_date_window("%Y-%m-%d", 0)
 
     resp = await client.get(
         _BASE,
@@ -119,15 +123,11 @@ async def fetch_live_mlb_games(client: httpx.AsyncClient) -> list[Game]:
             "startDate": start_date,
             "endDate": end_date,
             "gameType": "R",
-            "fields": (
-                "dates,date,games,gamePk,gameDate,"
-                "status,abstractGameState,"
-                "teams,home,away,team,name,abbreviation"
-            ),
+            "fields": _FIELDS,
         },
     )
     resp.raise_for_status()
-    data = resp.json()
+    data = read_json(resp)
 
     games: list[Game] = []
     for date_entry in data.get("dates", []):
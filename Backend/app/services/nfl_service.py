@@ -6,17 +6,19 @@ Only games with status "STATUS_SCHEDULED" (not yet started) are returned.
 """
 
 import logging
-from datetime import datetime, timezone, timedelta
 
 import httpx
 
 from app.config import settings
 from app.models.game import Game
+from app.services._schedule import utc_date_window
+from app.services.http_client import read_json
 
 logger = logging.getLogger(__name__)
 
 _BASE = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
 _CATEGORY = "football"
+_EMPTY: dict = {}
 
 _TEAM_MAP: dict[str, str] = {
     "ARI": "Arizona Cardinals",
@@ -55,20 +57,36 @@ _TEAM_MAP: dict[str, str] = {
 
 
 def _normalize(abbr: str, display_name: str) -> str:
-    return _TEAM_MAP.get(abbr.upper(), display_name)
+    # Keys are upper-case and the APIs already send upper-case
+    # abbreviations, so only re-case on a miss
+    name = _TEAM_MAP.get(abbr)
+    if name is None:
+        name = _TEAM_MAP.get(abbr.upper(), display_name)
+    return name
+
+
+def _home_away(competitors: list[dict]) -> tuple[dict | None, dict | None]:
+    # One pass over the competitors; the first entry per side wins
+    home = away = None
+    for c in competitors:
+        side = c.get("homeAway")
+        if side == "home":
+            if home is None:
+                home = c
+        elif side == "away" and away is None:
+            away = c
+    return home, away
 
 
 async def fetch_upcoming_nfl_games(client: httpx.AsyncClient) -> list[Game]:
-    now = datetime.now(timezone.utc)
-    start = now.strftime("%Y%m%d")
-    end = (now + timedelta(days=settings.days_ahead)).strftime("%Y%m%d")
+    start, end = utc_date_window("%Y%m%d", settings.days_ahead)
 
     resp = await client.get(_BASE, params={
         "dates": f"{start}-{end}",
         "seasontype": 2,   # 2 = regular season; excludes preseason (1) and playoffs (3)
     })
     resp.raise_for_status()
-    data = resp.json()
+    data = read_json(resp)
 
     games: list[Game] = []
     for event in data.get("events", []):
@@ -79,15 +97,16 @@ async def fetch_upcoming_nfl_games(client: httpx.AsyncClient) -> list[Game]:
         competition = event.get("competitions", [{}])[0]
         competitors = competition.get("competitors", [])
 
-        home = next((c for c in competitors if c.get("homeAway") == "home"), None)
-        away = next((c for c in competitors if c.get("homeAway") == "away"), None)
+        home, away = _home_away(competitors)
         if not home or not away:
             continue
 
-        home_abbr = home.get("team", {}).get("abbreviation", "")
-        home_display = home.get("team", {}).get("displayName", home_abbr)
-        away_abbr = away.get("team", {}).get("abbreviation", "")
-        away_display = away.get("team", {}).get("displayName", away_abbr)
+        home_team = home.get("team") or _EMPTY
+        away_team = away.get("team") or _EMPTY
+        home_abbr = home_team.get("abbreviation", "")
+        home_display = home_team.get("displayName", home_abbr)
+        away_abbr = away_team.get("abbreviation", "")
+        away_display = away_team.get("displayName", away_abbr)
         start_time = event.get("date", "")
 
         games.append(Game(
@@ -104,15 +123,14 @@ async def fetch_upcoming_nfl_games(client: httpx.AsyncClient) -> list[Game]:
 
 async def fetch_live_nfl_games(client: httpx.AsyncClient) -> list[Game]:
     """Fetch only in-progress (live) NFL games. Same scoreboard, filter STATUS_IN_PROGRESS."""
-    now = datetime.now(timezone.utc)
-    today = now.strftime("%Y%m%d")
+    today, _ = utc_date_window("%Y%m%d", 0)
 
     resp = await client.get(_BASE, params={
         "dates": today,
         "seasontype": 2,
     })
     resp.raise_for_status()
-    data = resp.json()
+    data = read_json(resp)
 
     games: list[Game] = []
     for event in data.get("events", []):
@@ -122,15 +140,16 @@ async def fetch_live_nfl_games(client: httpx.AsyncClient) -> list[Game]:
 
         competition = event.get("competitions", [{}])[0]
         competitors = competition.get("competitors", [])
-        home = next((c for c in competitors if c.get("homeAway") == "home"), None)
-        away = next((c for c in competitors if c.get("homeAway") == "away"), None)
+        home, away = _home_away(competitors)
         if not home or not away:
             continue
 
-        home_abbr = home.get("team", {}).get("abbreviation", "")
-        home_display = home.get("team", {}).get("displayName", home_abbr)
-        away_abbr = away.get("team", {}).get("abbreviation", "")
-        away_display = away.get("team", {}).get("displayName", away_abbr)
+        home_team = home.get("team") or _EMPTY
+        away_team = away.get("team") or _EMPTY
+        home_abbr = home_team.get("abbreviation", "")
+        home_display = home_team.get("displayName", home_abbr)
+        away_abbr = away_team.get("abbreviation", "")
+        away_display = away_team.get("displayName", away_abbr)
         start_time = event.get("date", "")
 
         games.append(Game(
@@ -1,14 +1,18 @@
 """
 NHL upcoming REGULAR SEASON games via the official NHL Stats API v1 (api-web.nhle.com).
 
-The schedule endpoint returns one week at a time. This service paginates week-by-week
-using the `nextStartDate` field in each response until `settings.days_ahead` days are covered.
+The schedule endpoint returns one week at a time. Every week start inside the
+`settings.days_ahead` window is known up front, so all pages are requested concurrently
+(at most `_MAX_CONCURRENT_WEEKS` in flight) instead of following `nextStartDate` one by one.
+Pages that came with an ETag / Last-Modified are re-requested conditionally, and a 304
+reuses the page parsed last time.
 
 Filters applied:
   - gameType == 2  → regular season only (1=pre, 2=regular, 3=playoffs)
   - gameState == "FUT" → not yet started
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 
@@ -16,12 +20,23 @@ import httpx
 
 from app.config import settings
 from app.models.game import Game
+from app.services.http_client import read_json
 
 logger = logging.getLogger(__name__)
 
 _BASE = "https://api-web.nhle.com/v1/schedule"
 _CATEGORY = "hockey"
+_EMPTY: dict = {}
 _REGULAR_SEASON_TYPE = 2
+_MAX_CONCURRENT_WEEKS = 8
+# States only occur as quoted string values, so a byte search on the raw body
+# can rule out a page without parsing it (off-days, off-season)
+_FUTURE_STATE = b'"FUT"'
+_LIVE_STATE = b'"LIVE"'
+
+# Week start date -> (conditional-request headers, parsed page). Schedule
+# pages rarely change between polls, so a 304 lets us reuse the parsed page.
+_page_cache: dict[str, tuple[dict[str, str], dict]] = {}
 
 _TEAM_MAP: dict[str, str] = {
     "ANA": "Anaheim Ducks",
@@ -61,28 +76,68 @@ _TEAM_MAP: dict[str, str] = {
 
 
 def _normalize(abbr: str, full_name: str) -> str:
-    return _TEAM_MAP.get(abbr.upper(), full_name)
+    # Keys are upper-case and the APIs already send upper-case
+    # abbreviations, so only re-case on a miss
+    name = _TEAM_MAP.get(abbr)
+    if name is None:
+        name = _TEAM_MAP.get(abbr.upper(), full_name)
+    return name
+
+
+def _validators(resp: httpx.Response) -> dict[str, str]:
+    """Conditional-request headers for re-fetching the page in *resp*."""
+    headers: dict[str, str] = {}
+    etag = resp.headers.get("ETag")
+    if etag:
+        headers["If-None-Match"] = etag
+    last_modified = resp.headers.get("Last-Modified")
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _week_starts(now: datetime, days_ahead: int) -> list[str]:
+    """Start date of each weekly schedule page that begins inside the window."""
+    return [
+        (now + timedelta(days=7 * week)).strftime("%Y-%m-%d")
+        for week in range(days_ahead // 7 + 1)
+    ]
 
 
 async def fetch_upcoming_nhl_games(client: httpx.AsyncClient) -> list[Game]:
     now = datetime.now(timezone.utc)
-    cutoff = now + timedelta(days=settings.days_ahead)
-    fetch_date = now.strftime("%Y-%m-%d")
-
-    games: list[Game] = []
-    visited: set[str] = set()   # prevent infinite loops on unexpected API responses
-
-    while fetch_date and fetch_date not in visited:
-        visited.add(fetch_date)
-
-        # Stop paginating once we've passed the lookahead window
-        if datetime.strptime(fetch_date, "%Y-%m-%d").replace(tzinfo=timezone.utc) > cutoff:
-            break
-
-        resp = await client.get(f"{_BASE}/{fetch_date}")
+    # ISO-8601 UTC strings order lexicographically, so compare as text
+    cutoff_iso = (now + timedelta(days=settings.days_ahead)).isoformat()
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_WEEKS)
+
+    async def fetch_week(fetch_date: str) -> dict:
+        cached = _page_cache.get(fetch_date)
+        async with semaphore:
+            resp = await client.get(
+                f"{_BASE}/{fetch_date}", headers=cached[0] if cached else None
+            )
+        if cached and resp.status_code == 304:
+            return cached[1]
         resp.raise_for_status()
-        data = resp.json()
+        page = read_json(resp) if _FUTURE_STATE in resp.content else {}
+        validators = _validators(resp)
+        if validators:
+            _page_cache[fetch_date] = (validators, page)
+        else:
+            _page_cache.pop(fetch_date, None)
+        return page
+
+    week_starts = _week_starts(now, settings.days_ahead)
+    pages = await asyncio.gather(*(fetch_week(fetch_date) for fetch_date in week_starts))
+    # Weeks that have rolled out of the window won't be requested again. The
+    # background games refresh prunes from its own thread too, so tolerate
+    # a key the other prune already removed.
+    for stale in _page_cache.keys() - set(week_starts):
+        _page_cache.pop(stale, None)
 
+    games: list[Game] = []
+    team_name = _TEAM_MAP.get  # _normalize, inlined for the per-game loop
+    for data in pages:
         for game_week in data.get("gameWeek", []):
             for game in game_week.get("games", []):
                 # gameType 2 = regular season; skip preseason (1) and playoffs (3)
@@ -94,27 +149,24 @@ async def fetch_upcoming_nhl_games(client: httpx.AsyncClient) -> list[Game]:
 
                 start_time = game.get("startTimeUTC", "")
                 # Skip games beyond our window
-                if start_time and start_time > cutoff.isoformat():
+                if start_time and start_time > cutoff_iso:
                     continue
 
-                home = game.get("homeTeam", {})
-                away = game.get("awayTeam", {})
+                home = game.get("homeTeam") or _EMPTY
+                away = game.get("awayTeam") or _EMPTY
                 home_abbr = home.get("abbrev", "")
-                home_name = home.get("name", {}).get("default", home_abbr)
+                home_name = (home.get("name") or _EMPTY).get("default", home_abbr)
                 away_abbr = away.get("abbrev", "")
-                away_name = away.get("name", {}).get("default", away_abbr)
+                away_name = (away.get("name") or _EMPTY).get("default", away_abbr)
 
                 games.append(Game(
                     category=_CATEGORY,
                     live=0,
-                    home_team=_normalize(home_abbr, home_name),
-                    away_team=_normalize(away_abbr, away_name),
+                    home_team=team_name(home_abbr) or team_name(home_abbr.upper(), home_name),
+                    away_team=team_name(away_abbr) or team_name(away_abbr.upper(), away_name),
                     start_time=start_time,
                 ))
 
-        # Advance to the next week using the API's own next-page pointer
-        fetch_date = data.get("nextStartDate")
-
     logger.info("NHL: fetched %d upcoming regular season games", len(games))
     return games
 
@@ -126,9 +178,13 @@ async def fetch_live_nhl_games(client: httpx.AsyncClient) -> list[Game]:
 
     resp = await client.get(f"{_BASE}/{fetch_date}")
     resp.raise_for_status()
-    data = resp.json()
+    if _LIVE_STATE not in resp.content:
+        logger.info("NHL: fetched 0 live games")
+        return []
+    data = read_json(resp)
 
     games: list[Game] = []
+    team_name = _TEAM_MAP.get  # _normalize, inlined for the per-game loop
     for game_week in data.get("gameWeek", []):
         for game in game_week.get("games", []):
             if game.get("gameType") != _REGULAR_SEASON_TYPE:
@@ -137,18 +193,18 @@ async def fetch_live_nhl_games(client: httpx.AsyncClient) -> list[Game]:
                 continue
 
             start_time = game.get("startTimeUTC", "")
-            home = game.get("homeTeam", {})
-            away = game.get("awayTeam", {})
+            home = game.get("homeTeam") or _EMPTY
+            away = game.get("awayTeam") or _EMPTY
             home_abbr = home.get("abbrev", "")
-            home_name = home.get("name", {}).get("default", home_abbr)
+            home_name = (home.get("name") or _EMPTY).get("default", home_abbr)
             away_abbr = away.get("abbrev", "")
-            away_name = away.get("name", {}).get("default", away_abbr)
+            away_name = (away.get("name") or _EMPTY).get("default", away_abbr)
 
             games.append(Game(
                 category=_CATEGORY,
                 live=1,
-                home_team=_normalize(home_abbr, home_name),
-                away_team=_normalize(away_abbr, away_name),
+                home_team=team_name(home_abbr) or team_name(home_abbr.upper(), home_name),
+                away_team=team_name(away_abbr) or team_name(away_abbr.upper(), away_name),
                 start_time=start_time,
             ))
 
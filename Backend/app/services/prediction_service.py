@@ -5,6 +5,7 @@ Lake for historical context.
 
 Exposes:
     predict(req)           — used by POST /predictions/
+    warm_up()              — used by the app lifespan (remote/auto modes)
     _get_model_service()   — used by game_prediction_service
 """
 
@@ -13,12 +14,18 @@ from app.services.local_model_service import LocalModelService, MARKET_TYPE_MAP
 from app.services.databricks_client import DatabricksServingClient
 from app.services.delta_lake_service import fetch_odds_for_games, fetch_upcoming_games
 
+import asyncio
 import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Union
 
-import numpy as np
 import torch
+from databricks.sdk.errors import DeadlineExceeded, TemporarilyUnavailable, TooManyRequests
 
 from app.config import settings
 from app.models.prediction import PredictionRequest
@@ -29,13 +36,93 @@ logger = logging.getLogger(__name__)
 
 # ── Databricks remote model service ──────────────────────────────────
 
+# 429/503/504 and network failures from the serving endpoint are worth
+# retrying; anything else (bad payload, auth) fails straight away
+_TRANSIENT_SERVING_ERRORS = (
+    TooManyRequests,
+    TemporarilyUnavailable,
+    DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+_SERVING_ATTEMPTS = 4
+
+
+def _serving_retry_delay(attempt: int) -> float:
+    """Full-jitter backoff: up to 0.5s, 1s, 2s, ... capped at 8s."""
+    return random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+
+
+class _CircuitBreaker:
+    """Fail fast once the endpoint keeps failing, then let a call through again.
+
+    After *threshold* consecutive failed queries the breaker opens for
+    *reset_seconds*; calls made meanwhile raise without touching the
+    network. After that the breaker is half-open: exactly one call is let
+    through as a trial and the rest keep failing fast until it finishes.
+    Success closes the breaker, failure re-opens it for another period.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self._threshold = threshold
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def check(self) -> bool:
+        """Raise if the call must fail fast; return True if it is the trial call.
+
+        The trial caller must finish with :meth:`record_success`,
+        :meth:`record_failure` or :meth:`release_probe`.
+        """
+        with self._lock:
+            if self._failures < self._threshold:
+                return False
+            now = time.monotonic()
+            if now < self._open_until or self._probing:
+                raise RuntimeError(
+                    "Databricks serving endpoint unavailable (circuit open, "
+                    f"retrying after {max(self._open_until - now, 0.0):.0f}s)"
+                )
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self._threshold:
+                self._open_until = time.monotonic() + self._reset_seconds
+
+    def release_probe(self) -> None:
+        """End a trial that neither succeeded nor failed transiently."""
+        with self._lock:
+            self._probing = False
+
+
+# Shared by every DatabricksModelService in the process
+_serving_breaker = _CircuitBreaker(threshold=5, reset_seconds=30.0)
+
 
 class DatabricksModelService:
     """Calls the Databricks serving endpoint with the same interface as LocalModelService."""
 
     def __init__(self, client: DatabricksServingClient) -> None:
         self._client = client
-        # Verify connectivity with a lightweight probe (timeout after 10s)
+
+    def warm_up(self) -> None:
+        """Probe the endpoint so connection setup and scale-up happen early.
+
+        Blocks for one round-trip (timeout after 10s); failures are logged,
+        not raised.
+        """
         logger.info("DatabricksModelService: verifying endpoint connectivity")
         try:
             self._client.query([{"probe": True}])
@@ -44,6 +131,33 @@ class DatabricksModelService:
             logger.warning(
                 "DatabricksModelService: probe failed (%s), continuing anyway", exc)
 
+    def _query(self, records: list[dict]) -> dict:
+        """Query the endpoint, retrying transient errors behind the circuit breaker."""
+        probe = _serving_breaker.check()
+        try:
+            for attempt in range(_SERVING_ATTEMPTS - 1):
+                try:
+                    resp = self._client.query(records)
+                except _TRANSIENT_SERVING_ERRORS as exc:
+                    delay = _serving_retry_delay(attempt)
+                    logger.warning(
+                        "Transient serving error (%s), retrying in %.2fs", exc, delay)
+                    time.sleep(delay)
+                else:
+                    _serving_breaker.record_success()
+                    return resp
+            try:
+                resp = self._client.query(records)
+            except _TRANSIENT_SERVING_ERRORS:
+                _serving_breaker.record_failure()
+                raise
+            _serving_breaker.record_success()
+            return resp
+        finally:
+            # A non-transient error records nothing; don't leave the trial pending
+            if probe:
+                _serving_breaker.release_probe()
+
     def predict(
         self,
         features: torch.Tensor,
@@ -52,11 +166,11 @@ class DatabricksModelService:
     ) -> torch.Tensor:
         """Serialize tensors, call the remote endpoint, return a score tensor."""
         record = {
-            "features": features.numpy().tolist(),
-            "mask": mask.numpy().tolist(),
-            "market_type": market_type.numpy().tolist(),
+            "features": features.tolist(),
+            "mask": mask.tolist(),
+            "market_type": market_type.tolist(),
         }
-        resp = self._client.query([record])
+        resp = self._query([record])
         predictions = resp.get("predictions", resp.get("outputs"))
         if predictions is None:
             raise RuntimeError(f"Unexpected serving response: {resp}")
@@ -64,38 +178,98 @@ class DatabricksModelService:
             predictions[0], (int, float)) else predictions[0][0]
         return torch.tensor([score], dtype=torch.float64)
 
+    def predict_batch(
+        self,
+        features: torch.Tensor,
+        mask: torch.Tensor,
+        market_type: torch.Tensor,
+    ) -> list[float]:
+        """Score a pre-stacked batch, one record per row.
+
+        Records are sent ``settings.ml_batch_size`` per endpoint call, so a
+        large batch costs a handful of round-trips without building one
+        unbounded payload. The calls run up to ``settings.ml_max_concurrency``
+        at a time; when ``settings.ml_request_delay_seconds`` is set they
+        run one by one with that delay between them, for rate limiting.
+        """
+        records = [
+            {"features": [f], "mask": [m], "market_type": [mt]}
+            for f, m, mt in zip(
+                features.tolist(),
+                mask.tolist(),
+                market_type.tolist(),
+            )
+        ]
+        size = max(1, settings.ml_batch_size)
+        chunks = [records[i:i + size] for i in range(0, len(records), size)]
+        delay = settings.ml_request_delay_seconds
+        workers = min(max(1, settings.ml_max_concurrency), len(chunks))
+
+        scores: list[float] = []
+        if delay > 0 or workers <= 1:
+            for i, chunk in enumerate(chunks):
+                if i and delay > 0:
+                    time.sleep(delay)
+                scores.extend(self._query_chunk(chunk))
+            return scores
+
+        # Each call is an independent HTTPS round-trip; map keeps input order
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk_scores in pool.map(self._query_chunk, chunks):
+                scores.extend(chunk_scores)
+        return scores
+
+    def _query_chunk(self, records: list[dict]) -> list[float]:
+        """Send one chunk of records and return its scores in order."""
+        resp = self._query(records)
+        predictions = resp.get("predictions", resp.get("outputs"))
+        if predictions is None or len(predictions) != len(records):
+            raise RuntimeError(f"Unexpected serving response: {resp}")
+        return [
+            float(p) if isinstance(p, (int, float)) else float(p[0])
+            for p in predictions
+        ]
+
     def predict_from_request(self, req: PredictionRequest) -> dict:
         """Build a dataframe record from request fields and send to endpoint."""
+        market_str = (req.market_type or "MONEYLINE").upper()
+        return self.predict_markets_from_request(req, [market_str])[0]
+
+    def predict_markets_from_request(
+        self, req: PredictionRequest, market_types: list[str]
+    ) -> list[dict]:
+        """Score one request under several market types with one endpoint call."""
         bookmakers = list(req.current_odds.keys())
         if len(bookmakers) < 2:
-            return {"score": None, "error": "Need at least 2 bookmakers"}
+            return [
+                {"score": None, "error": "Need at least 2 bookmakers"}
+                for _ in market_types
+            ]
 
-        odds_a = np.array(req.current_odds[bookmakers[0]], dtype=np.float64)
-        odds_b = np.array(req.current_odds[bookmakers[1]], dtype=np.float64)
-
-        record = {
+        base = {
             "category": req.category,
             "date": req.date,
             "live": req.live,
             "home_team": req.home_team,
             "away_team": req.away_team,
-            "market_type": (req.market_type or "MONEYLINE").upper(),
             "value": req.value,
-            "odds_a": odds_a.tolist(),
-            "odds_b": odds_b.tolist(),
+            "odds_a": list(req.current_odds[bookmakers[0]]),
+            "odds_b": list(req.current_odds[bookmakers[1]]),
         }
-        resp = self._client.query([record])
+        records = [{**base, "market_type": mt.upper()} for mt in market_types]
+        resp = self._query(records)
         predictions = resp.get("predictions", resp.get("outputs"))
-        if predictions is None:
+        if predictions is None or len(predictions) != len(records):
             raise RuntimeError(f"Unexpected serving response: {resp}")
 
-        score = predictions[0] if isinstance(
-            predictions[0], (int, float)) else predictions[0][0]
-        return {
-            "score": float(score),
-            "market_type": record["market_type"],
-            "bookmakers_used": bookmakers[:2],
-        }
+        return [
+            {
+                "score": float(p) if isinstance(p, (int, float)) else float(p[0]),
+                "market_type": record["market_type"],
+                "bookmakers_used": bookmakers[:2],
+            }
+            for p, record in zip(predictions, records)
+        ]
 
 
 # ── Model service singleton ──────────────────────────────────────────
@@ -112,7 +286,7 @@ def _init_local() -> LocalModelService:
             "Run the training notebook and copy model.ckpt to "
             "Backend/models/model.ckpt"
         )
-    return LocalModelService(str(ckpt))
+    return LocalModelService(str(ckpt), num_threads=settings.model_intra_threads)
 
 
 def _init_remote() -> DatabricksModelService:
@@ -166,6 +340,21 @@ def _get_model_service() -> Union[LocalModelService, DatabricksModelService]:
     return _model_service
 
 
+async def warm_up() -> None:
+    """Create the model service and probe the remote endpoint off the loop.
+
+    Meant to run as a background task at app startup so neither the
+    service init nor the probe round-trip lands on the first request.
+    Failures are logged, not raised.
+    """
+    try:
+        service = await asyncio.to_thread(_get_model_service)
+        if isinstance(service, DatabricksModelService):
+            await asyncio.to_thread(service.warm_up)
+    except Exception:
+        logger.warning("Model service warm-up failed", exc_info=True)
+
+
 def _decimal_to_american(decimal_odds: float) -> int:
     """Convert decimal odds to American odds."""
     if decimal_odds >= 2.0:
@@ -173,31 +362,33 @@ def _decimal_to_american(decimal_odds: float) -> int:
     return round(-100 / (decimal_odds - 1))
 
 
+def _mean(values: list[float]) -> float:
+    """Mean of a short odds list; NaN when empty, like ndarray.mean()."""
+    return sum(values) / len(values) if values else float("nan")
+
+
+# Indexed by ``confidence >= 0.5``
+_SIDES = ("away_team", "home_team")
+_TOTAL_DIRECTIONS = ("under", "over")
+_MONEYLINE_TEXT = ("away_team wins", "home_team wins")
+
+
 def _derive_prediction(market_type: str, confidence: float, req: PredictionRequest) -> str:
     """Build human-readable prediction text from market type and request."""
-    mt = market_type.lower()
-    if mt == "points_spread":
-        side = "home_team" if confidence >= 0.5 else "away_team"
+    # Market types arrive upper-cased from the model services
+    mt = market_type if market_type.isupper() else market_type.upper()
+    favoured = confidence >= 0.5
+    if mt == "POINTS_SPREAD":
         sign = "+" if req.value > 0 else ""
-        return f"{side} {sign}{req.value}"
-    if mt == "points_total":
-        direction = "over" if confidence >= 0.5 else "under"
-        return f"{direction} {req.value}"
+        return f"{_SIDES[favoured]} {sign}{req.value}"
+    if mt == "POINTS_TOTAL":
+        return f"{_TOTAL_DIRECTIONS[favoured]} {req.value}"
     # moneyline
-    side = "home_team" if confidence >= 0.5 else "away_team"
-    return f"{side} wins"
-
-
-def _predict_single(req: PredictionRequest, market_type_override: str | None = None) -> MarketPrediction:
-    """Run inference for a single market type and return a MarketPrediction."""
-    svc = _get_model_service()
-
-    # If overriding market type, create a copy with the desired type
-    if market_type_override:
-        req = req.model_copy(update={"market_type": market_type_override})
+    return _MONEYLINE_TEXT[favoured]
 
-    result = svc.predict_from_request(req)
 
+def _to_market_prediction(req: PredictionRequest, result: dict) -> MarketPrediction:
+    """Turn a model service score dict for *req* into a MarketPrediction."""
     bookmakers = result.get(
         "bookmakers_used", list(req.current_odds.keys())[:2])
     confidence = result.get("score", 0.0) or 0.0
@@ -205,10 +396,8 @@ def _predict_single(req: PredictionRequest, market_type_override: str | None = N
         "market_type", (req.market_type or "MONEYLINE").upper())
 
     # Convert mean decimal odds per bookmaker to American prices
-    odds_a = np.array(req.current_odds[bookmakers[0]], dtype=np.float64)
-    odds_b = np.array(req.current_odds[bookmakers[1]], dtype=np.float64)
-    price_1 = _decimal_to_american(float(odds_a.mean()))
-    price_2 = _decimal_to_american(float(odds_b.mean()))
+    price_1 = _decimal_to_american(_mean(req.current_odds[bookmakers[0]]))
+    price_2 = _decimal_to_american(_mean(req.current_odds[bookmakers[1]]))
 
     prediction = _derive_prediction(market_type, confidence, req)
 
@@ -224,6 +413,58 @@ def _predict_single(req: PredictionRequest, market_type_override: str | None = N
     )
 
 
+# ── Recent prediction cache ──────────────────────────────────────────
+
+# Request key -> (expires_at monotonic, score dicts). UI refreshes resend
+# identical requests, so their scores are reused for a short while.
+_score_cache: OrderedDict[tuple, tuple[float, list[dict]]] = OrderedDict()
+_score_cache_lock = threading.Lock()
+_SCORE_CACHE_SIZE = 1024
+
+
+def _request_key(req: PredictionRequest, market_types: list[str]) -> tuple:
+    # Bookmaker order is kept: the first two bookmakers are the ones scored
+    return (
+        req.category,
+        req.date,
+        req.live,
+        req.home_team,
+        req.away_team,
+        req.value,
+        tuple((bookmaker, tuple(odds)) for bookmaker, odds in req.current_odds.items()),
+        tuple(market_types),
+    )
+
+
+def _score_markets(req: PredictionRequest, market_types: list[str]) -> list[dict]:
+    """Score *req* under *market_types*, reusing a recent identical request's scores."""
+    ttl = settings.prediction_cache_ttl_seconds
+    if ttl <= 0:
+        return _get_model_service().predict_markets_from_request(req, market_types)
+
+    key = _request_key(req, market_types)
+    now = time.monotonic()
+    with _score_cache_lock:
+        cached = _score_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _score_cache.move_to_end(key)
+            return cached[1]
+
+    results = _get_model_service().predict_markets_from_request(req, market_types)
+    with _score_cache_lock:
+        _score_cache[key] = (now + ttl, results)
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > _SCORE_CACHE_SIZE:
+            _score_cache.popitem(last=False)
+    return results
+
+
+def _predict_single(req: PredictionRequest) -> MarketPrediction:
+    """Run inference for the request's market type and return a MarketPrediction."""
+    market_str = (req.market_type or "MONEYLINE").upper()
+    return _to_market_prediction(req, _score_markets(req, [market_str])[0])
+
+
 def predict(req: PredictionRequest) -> list[MarketPrediction] | MarketPrediction:
     """Accept a PredictionRequest, run model inference, return predictions.
 
@@ -236,11 +477,9 @@ def predict(req: PredictionRequest) -> list[MarketPrediction] | MarketPrediction
             "current_odds must contain at least 2 bookmakers"
         )
 
-    # Pre-game with no specific market → return all 3
+    # Pre-game with no specific market → return all 3, scored in one pass
     if req.live == 0 and not req.market_type:
-        return [
-            _predict_single(req, mt)
-            for mt in MARKET_TYPE_MAP
-        ]
+        results = _score_markets(req, list(MARKET_TYPE_MAP))
+        return [_to_market_prediction(req, result) for result in results]
 
     return _predict_single(req)
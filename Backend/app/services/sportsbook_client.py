@@ -9,15 +9,36 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 
 import httpx
 
+from ._json import loads
+
 logger = logging.getLogger(__name__)
 
 # Retryable HTTP status codes
 _RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
 _MAX_RETRIES = 5
 _BACKOFF_BASE = 2.0  # seconds
+# Base wait per attempt (index = attempt number); jittered in _request
+_BACKOFF_TABLE = tuple(_BACKOFF_BASE**attempt for attempt in range(_MAX_RETRIES + 1))
+
+# The collector fans out events -> markets -> outcomes/opening/closing,
+# so keep plenty of warm connections; retries are handled in _request
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=50,
+    max_connections=200,
+    keepalive_expiry=30.0,
+)
+# Per-attempt deadlines; a timed-out attempt is retried like any other
+# transport error instead of holding a pooled connection indefinitely
+_DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
+
+
+def _backoff(attempt: int) -> float:
+    """Jittered exponential backoff, so throttled callers don't retry in lockstep."""
+    return _BACKOFF_TABLE[attempt] * (0.5 + random.random())
 
 
 class SportsbookAPIClient:
@@ -36,12 +57,14 @@ class SportsbookAPIClient:
             "X-RapidAPI-Key": rapidapi_key,
             "X-RapidAPI-Host": rapidapi_host,
         }
-        print(self._headers)
         self._delay = rate_limit_delay
         self._client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers=self._headers,
-            timeout=None,
+            timeout=_DEFAULT_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True, limits=_POOL_LIMITS, retries=0
+            ),
         )
 
     async def close(self) -> None:
@@ -67,7 +90,7 @@ class SportsbookAPIClient:
                 resp = await self._client.request(method, path, **kwargs)
 
                 if resp.status_code in _RETRYABLE_STATUSES:
-                    wait = _BACKOFF_BASE**attempt
+                    wait = _backoff(attempt)
                     logger.warning(
                         "Retryable status %s on %s (attempt %d/%d), waiting %.1fs",
                         resp.status_code,
@@ -80,13 +103,21 @@ class SportsbookAPIClient:
                     continue
 
                 resp.raise_for_status()
-                return resp.json()
-
-            except httpx.HTTPStatusError:
+                return loads(resp.content)
+
+            except httpx.HTTPStatusError as exc:
+                # Callers decide how serious a 4xx is (some are expected
+                # and handled), so only record the body for debugging
+                logger.debug(
+                    "Non-retryable status %s on %s: %.500s",
+                    exc.response.status_code,
+                    path,
+                    exc.response.text,
+                )
                 raise
             except httpx.HTTPError as exc:
                 last_exc = exc
-                wait = _BACKOFF_BASE**attempt
+                wait = _backoff(attempt)
                 logger.warning(
                     "Request error on %s (attempt %d/%d): %s — retrying in %.1fs",
                     path,
@@ -129,6 +160,41 @@ class SportsbookAPIClient:
             return data.get("data", data.get("events", []))
         return data
 
+    async def get_events_with_markets(
+        self,
+        competition: str,
+        start: str,
+        end: str,
+        market_types: tuple[str, ...] = ("MONEYLINE", "POINT_SPREAD", "POINT_TOTAL"),
+        segment: str = "FULL_MATCH",
+    ) -> list[dict]:
+        """Fetch events with their markets embedded, in a single request.
+
+        Each returned event carries a ``markets`` list filtered server-side
+        to *market_types* and *segment*. Events without a ``markets`` key
+        were not expanded and need a ``get_event_markets`` call.
+
+        Args:
+            competition: Competition slug (e.g. "NBA", "NFL").
+            start: ISO date string for startTimeFrom.
+            end: ISO date string for startTimeTo.
+            market_types: Market types to include.
+            segment: Market segment to include.
+        """
+        data = await self._get(
+            f"/v1/competitions/{competition}/events",
+            params={
+                "startTimeFrom": start,
+                "startTimeTo": end,
+                "include": "markets",
+                "marketTypes": ",".join(market_types),
+                "segment": segment,
+            },
+        )
+        if isinstance(data, dict):
+            return data.get("data", data.get("events", []))
+        return data
+
     async def get_event_markets(self, event_key: str) -> list[dict]:
         """Fetch all markets for a given event."""
         data = await self._get(f"/v0/events/{event_key}/markets")
@@ -143,16 +209,18 @@ class SportsbookAPIClient:
     async def get_market_outcomes(
         self,
         market_key: str,
-        sources: list[str] | None = None,
+        sources: list[str] | str | None = None,
         is_live: bool | None = None,
     ) -> list[dict]:
         """Fetch all historical odds for a market.
 
         Args:
             market_key: The market identifier.
-            sources: Optional list of sportsbook source filters.
+            sources: Optional sportsbook source filter, or a list of them.
             is_live: Optional filter for live vs pre-game odds.
         """
+        if isinstance(sources, str):
+            sources = [sources]
         params: list[tuple[str, str]] = []
         if sources:
             for s in sources:
@@ -1,7 +1,44 @@
 """Supabase service for storing arbitrage execution data."""
+from postgrest import APIError, ReturnMethod
 from supabase import create_client, Client
 from app.config import settings
 
+_EMPTY: dict = {}
+# Rows per insert request; keeps each PostgREST payload bounded and lets
+# one bad batch fail without losing the rest
+BATCH_SIZE = 500
+
+# Database function that truncates arbitrage_executions, created once by
+# scripts/create_truncate_arbitrage_executions.sql (executable by
+# service_role only, since the anon key ships to browsers).
+TRUNCATE_RPC = "truncate_arbitrage_executions"
+
+
+def _execution_row(node: dict) -> dict:
+    """Map an arbitrage node onto an arbitrage_executions table row."""
+    get = node.get
+    # Extract sportsbook data (expecting 2 sportsbooks)
+    sportsbooks = get("sportsbooks") or ()
+    book_1 = sportsbooks[0] if len(sportsbooks) > 0 else _EMPTY
+    book_2 = sportsbooks[1] if len(sportsbooks) > 1 else _EMPTY
+    odds_1 = book_1.get("odds", "")
+    odds_2 = book_2.get("odds", "")
+    return {
+        "category": get("category", ""),
+        "home_team": get("home_team", ""),
+        "away_team": get("away_team", ""),
+        "game_date": get("date", ""),
+        "market_type": get("market_type", ""),
+        "profit_score": get("profit_score", 0.0),
+        "risk_score": get("risk_score", 0.0),
+        "confidence": get("confidence", 0.0),
+        "volume": get("volume", 0),
+        "bookmaker_1": book_1.get("name", ""),
+        "odds_1": odds_1 if type(odds_1) is str else str(odds_1),
+        "bookmaker_2": book_2.get("name", ""),
+        "odds_2": odds_2 if type(odds_2) is str else str(odds_2),
+    }
+
 
 class SupabaseService:
     """Service for interacting with Supabase database."""
@@ -9,10 +46,12 @@ class SupabaseService:
     def __init__(self):
         """Initialize Supabase client."""
         self.client: Client | None = None
+        # Cleared once PostgREST reports TRUNCATE_RPC missing or not granted
+        self._truncate_rpc = True
         if settings.supabase_url and settings.supabase_key:
             self.client = create_client(settings.supabase_url, settings.supabase_key)
 
-    def store_arbitrage_execution(self, node: dict) -> dict | None:
+    def store_arbitrage_execution(self, node: dict) -> bool:
         """
         Store a single arbitrage execution node to Supabase.
 
@@ -23,97 +62,76 @@ class SupabaseService:
                 - sportsbooks: list of dicts with 'name' and 'odds'
 
         Returns:
-            The inserted record or None if client not configured
+            True if the row was stored, False on error or if client not configured
         """
         if not self.client:
-            return None
-
-        # Extract sportsbook data (expecting 2 sportsbooks)
-        sportsbooks = node.get("sportsbooks", [])
-        bookmaker_1 = sportsbooks[0].get("name", "") if len(sportsbooks) > 0 else ""
-        odds_1 = sportsbooks[0].get("odds", "") if len(sportsbooks) > 0 else ""
-        bookmaker_2 = sportsbooks[1].get("name", "") if len(sportsbooks) > 1 else ""
-        odds_2 = sportsbooks[1].get("odds", "") if len(sportsbooks) > 1 else ""
-
-        # Prepare data for insertion
-        data = {
-            "category": node.get("category", ""),
-            "home_team": node.get("home_team", ""),
-            "away_team": node.get("away_team", ""),
-            "game_date": node.get("date", ""),
-            "market_type": node.get("market_type", ""),
-            "profit_score": node.get("profit_score", 0.0),
-            "risk_score": node.get("risk_score", 0.0),
-            "confidence": node.get("confidence", 0.0),
-            "volume": node.get("volume", 0),
-            "bookmaker_1": bookmaker_1,
-            "odds_1": str(odds_1),
-            "bookmaker_2": bookmaker_2,
-            "odds_2": str(odds_2),
-        }
+            return False
+
+        data = _execution_row(node)
 
         try:
-            response = self.client.table("arbitrage_executions").insert(data).execute()
-            return response.data[0] if response.data else None
+            # return=minimal: PostgREST doesn't echo the inserted row back
+            self.client.table("arbitrage_executions").insert(
+                data, returning=ReturnMethod.minimal
+            ).execute()
+            return True
         except Exception as e:
             print(f"Error storing arbitrage execution: {e}")
-            return None
+            return False
 
-    def store_arbitrage_executions_bulk(self, nodes: list[dict]) -> list[dict]:
+    def store_arbitrage_executions_bulk(self, nodes: list[dict]) -> int:
         """
         Store multiple arbitrage execution nodes to Supabase in bulk.
 
+        Rows are inserted BATCH_SIZE at a time; a failed batch is reported
+        and skipped, and the remaining batches are still inserted.
+
         Args:
             nodes: List of dicts containing arbitrage execution data
 
         Returns:
-            List of inserted records or empty list if client not configured
+            Number of rows stored (0 if client not configured)
         """
         if not self.client:
-            return []
-
-        # Prepare all data for bulk insertion
-        data_list = []
-        for node in nodes:
-            sportsbooks = node.get("sportsbooks", [])
-            bookmaker_1 = sportsbooks[0].get("name", "") if len(sportsbooks) > 0 else ""
-            odds_1 = sportsbooks[0].get("odds", "") if len(sportsbooks) > 0 else ""
-            bookmaker_2 = sportsbooks[1].get("name", "") if len(sportsbooks) > 1 else ""
-            odds_2 = sportsbooks[1].get("odds", "") if len(sportsbooks) > 1 else ""
-
-            data_list.append({
-                "category": node.get("category", ""),
-                "home_team": node.get("home_team", ""),
-                "away_team": node.get("away_team", ""),
-                "game_date": node.get("date", ""),
-                "market_type": node.get("market_type", ""),
-                "profit_score": node.get("profit_score", 0.0),
-                "risk_score": node.get("risk_score", 0.0),
-                "confidence": node.get("confidence", 0.0),
-                "volume": node.get("volume", 0),
-                "bookmaker_1": bookmaker_1,
-                "odds_1": str(odds_1),
-                "bookmaker_2": bookmaker_2,
-                "odds_2": str(odds_2),
-            })
-
-        try:
-            response = self.client.table("arbitrage_executions").insert(data_list).execute()
-            return response.data if response.data else []
-        except Exception as e:
-            print(f"Error storing arbitrage executions in bulk: {e}")
-            return []
+            return 0
+
+        data_list = [_execution_row(node) for node in nodes]
+        table = self.client.table("arbitrage_executions")
+
+        stored = 0
+        for start in range(0, len(data_list), BATCH_SIZE):
+            batch = data_list[start:start + BATCH_SIZE]
+            try:
+                table.insert(batch, returning=ReturnMethod.minimal).execute()
+            except Exception as e:
+                print(f"Error storing arbitrage executions batch at row {start}: {e}")
+                continue
+            stored += len(batch)
+        return stored
 
     def clear_arbitrage_executions(self) -> bool:
         """
         Delete all records from the arbitrage_executions table.
 
+        Uses the TRUNCATE_RPC database function when it is installed, which
+        empties the table in one step instead of deleting row by row.
+
         Returns:
             True if successful, False otherwise
         """
         if not self.client:
             return False
 
+        if self._truncate_rpc:
+            try:
+                self.client.rpc(TRUNCATE_RPC).execute()
+                return True
+            except Exception as e:
+                print(f"Truncate RPC failed, falling back to delete: {e}")
+                # PGRST202: no such function, 42501: not granted; stop trying it
+                if isinstance(e, APIError) and e.code in ("PGRST202", "42501"):
+                    self._truncate_rpc = False
+
         try:
             # Delete all records from the table using neq filter (not equal to empty string)
             # This effectively selects all rows since all IDs exist
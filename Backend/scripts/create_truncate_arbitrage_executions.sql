@@ -0,0 +1,25 @@
+-- Database function used by SupabaseService.clear_arbitrage_executions
+-- (app/services/supabase_service.py, TRUNCATE_RPC) to empty the
+-- arbitrage_executions table in one statement instead of a filtered DELETE.
+--
+-- Usage: run once in the Supabase SQL editor, or with
+--     psql "$DATABASE_URL" -f scripts/create_truncate_arbitrage_executions.sql
+--
+-- Without it the backend falls back to DELETE ... WHERE id <> ''.
+
+CREATE OR REPLACE FUNCTION public.truncate_arbitrage_executions() RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  TRUNCATE TABLE public.arbitrage_executions RESTART IDENTITY;
+$$;
+
+-- Only the role whose key the backend uses may call it; the anon key ships
+-- to browsers.
+REVOKE EXECUTE ON FUNCTION public.truncate_arbitrage_executions() FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.truncate_arbitrage_executions() FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.truncate_arbitrage_executions() TO service_role;
+
+-- Make PostgREST pick up the new function without a restart
+NOTIFY pgrst, 'reload schema';
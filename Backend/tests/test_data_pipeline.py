@@ -0,0 +1,82 @@
+"""
+Tests for the Sportsbook data collection pipeline's checkpointing.
+
+The Sportsbook API client is replaced with an in-memory fake, and output
+goes to a temporary directory.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from Backend.app.services import data_pipeline
+from Backend.app.services.data_pipeline import DataCollectionPipeline
+
+
+class FakeClient:
+    def __init__(self, n_events: int) -> None:
+        self.n_events = n_events
+
+    async def get_events_with_markets(self, competition, start, end, **kwargs):
+        return [
+            {"key": f"E{i}", "name": f"Event {i}", "homeParticipantKey": "H",
+             "participants": [{"key": "H", "name": "Home"}, {"key": "A", "name": "Away"}],
+             "markets": [{"key": f"E{i}-ML", "type": "MONEYLINE", "segment": "FULL_MATCH"}]}
+            for i in range(self.n_events)
+        ]
+
+    async def get_opening_odds(self, market_key):
+        return [{"key": "o", "payout": 1.9, "time": "2024-01-01T00:00:00Z"}]
+
+    async def get_closing_odds(self, market_key):
+        return [{"key": "c", "payout": 2.0, "time": "2024-01-02T00:00:00Z"}]
+
+    async def get_market_outcomes(self, market_key, sources=None):
+        return [{"key": "x", "payout": 1.95, "participantKey": "H"}]
+
+
+class TestCheckpoint:
+    def test_load_merges_snapshot_and_log(self, tmp_path):
+        pipeline = DataCollectionPipeline(FakeClient(0), str(tmp_path))
+        pipeline._save_checkpoint("NBA", "2024-25", {"E0", "E1"})
+        pipeline._append_checkpoint("NBA", "2024-25", ["E2", "E3"])
+        assert pipeline._load_checkpoint("NBA", "2024-25") == {"E0", "E1", "E2", "E3"}
+
+    def test_save_folds_log_into_snapshot(self, tmp_path):
+        pipeline = DataCollectionPipeline(FakeClient(0), str(tmp_path))
+        pipeline._append_checkpoint("NBA", "2024-25", ["E0"])
+        log = pipeline._checkpoint_log_path("NBA", "2024-25")
+        assert log.exists()
+
+        pipeline._save_checkpoint("NBA", "2024-25", pipeline._load_checkpoint("NBA", "2024-25"))
+        assert not log.exists()
+        assert pipeline._load_checkpoint("NBA", "2024-25") == {"E0"}
+
+    def test_events_are_logged_only_after_their_rows_are_written(self, tmp_path):
+        pipeline = DataCollectionPipeline(FakeClient(3), str(tmp_path))
+        real_flush = pipeline._flush_parquet
+        calls = []
+
+        def flush_then_crash(*args):
+            calls.append(args)
+            if len(calls) > 1:
+                raise OSError("disk full")
+            real_flush(*args)
+
+        with patch.object(data_pipeline, "_FLUSH_EVERY", 2), \
+                patch.object(pipeline, "_flush_parquet", flush_then_crash):
+            with pytest.raises(OSError):
+                asyncio.run(pipeline.collect("NBA", "2024-01-01", "2024-02-01"))
+
+        log = pipeline._checkpoint_log_path("NBA", "2024-25")
+        assert log.read_text(encoding="utf-8").split() == ["E0", "E1"]
+        assert len(list((tmp_path / "events").rglob("*.parquet"))) == 1
+
+    def test_rerun_skips_completed_events(self, tmp_path):
+        pipeline = DataCollectionPipeline(FakeClient(3), str(tmp_path))
+        asyncio.run(pipeline.collect("NBA", "2024-01-01", "2024-02-01"))
+        asyncio.run(pipeline.collect("NBA", "2024-01-01", "2024-02-01"))
+
+        assert pipeline._load_checkpoint("NBA", "2024-25") == {"E0", "E1", "E2"}
+        assert len(list((tmp_path / "events").rglob("*.parquet"))) == 1
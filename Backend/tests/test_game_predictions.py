@@ -0,0 +1,110 @@
+"""
+Tests for game_prediction_service._score_games.
+
+The model service is replaced with a stub, so these run without the
+checkpoint or the Databricks endpoint.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from app.services import game_prediction_service as gps
+
+GAME = {"game_id": "g1", "category": "basketball", "home_team": "A",
+        "away_team": "B", "start_time": "2026-01-01T00:00:00Z"}
+
+
+def odds_row(market_type: str, bookmaker: str, price: int, side: str = "home") -> dict:
+    return {"game_id": "g1", "market_type": market_type, "bookmaker": bookmaker,
+            "price": price, "outcome_side": side, "line_value": None}
+
+
+# Every market has a combined implied probability below 1.0, so all are scored
+ARB_ODDS = [
+    odds_row("moneyline", "DraftKings", 120),
+    odds_row("moneyline", "FanDuel", 110, "away"),
+    odds_row("spread", "DraftKings", 105),
+    odds_row("spread", "ESPNBet", 115, "away"),
+    odds_row("points_total", "DraftKings", 125, "over"),
+    odds_row("points_total", "FanDuel", 102, "under"),
+]
+
+
+def patch_model(predict_batch) -> MagicMock:
+    service = MagicMock()
+    service.predict_batch.side_effect = predict_batch
+    return patch.object(gps, "_get_model_service", return_value=service), service
+
+
+def score(odds: list[dict]) -> list[dict]:
+    return gps._score_games([GAME], [odds])[0]
+
+
+class TestScoreGamesFailures:
+    def test_batch_failure_retries_each_market(self):
+        calls = []
+
+        def predict(features, mask, market):
+            calls.append(len(market))
+            if len(market) > 1:
+                raise RuntimeError("batch rejected")
+            return [0.7]
+
+        patcher, _ = patch_model(predict)
+        with patcher:
+            markets = score(ARB_ODDS)
+        assert calls == [3, 1, 1, 1]
+        assert [m["confidence"] for m in markets] == [0.7, 0.7, 0.7]
+
+    def test_failed_market_only_drops_itself(self):
+        def predict(features, mask, market):
+            if len(market) > 1 or market.tolist() == [gps._MODEL_INDEX[1]]:
+                raise RuntimeError("bad row")
+            return [0.6]
+
+        patcher, _ = patch_model(predict)
+        with patcher:
+            markets = score(ARB_ODDS)
+        assert [m["market_type"] for m in markets] == ["moneyline", "points_total"]
+
+
+class TestNoArbSkip:
+    # +100/+100 sums to exactly 1.0; +100/+101 sums to just under it
+    BOUNDARY_ODDS = [
+        odds_row("moneyline", "DraftKings", 100),
+        odds_row("moneyline", "FanDuel", 100, "away"),
+        odds_row("spread", "DraftKings", 100),
+        odds_row("spread", "FanDuel", 101, "away"),
+    ]
+    NO_ARB_ODDS = [
+        odds_row("moneyline", "DraftKings", -110),
+        odds_row("moneyline", "FanDuel", -110, "away"),
+        odds_row("points_total", "DraftKings", -115, "over"),
+        odds_row("points_total", "FanDuel", -105, "under"),
+    ]
+
+    def test_skips_at_threshold_and_scores_below_it(self):
+        patcher, service = patch_model(lambda f, m, mt: [0.8] * len(mt))
+        with patcher:
+            markets = {m["market_type"]: m for m in score(self.BOUNDARY_ODDS)}
+        assert markets["moneyline"]["confidence"] == 0.0
+        assert markets["moneyline"]["prediction"] == gps._NO_ARB_PREDICTION == "no arbitrage"
+        assert markets["spread"]["confidence"] == 0.8
+        # Only the spread pair reached the model
+        (features, _, _), _ = service.predict_batch.call_args
+        assert len(features) == 1
+
+    def test_model_not_called_when_every_market_is_no_arb(self):
+        with patch.object(gps, "_get_model_service") as get_service:
+            markets = score(self.NO_ARB_ODDS)
+        get_service.assert_not_called()
+        assert [(m["market_type"], m["confidence"], m["prediction"]) for m in markets] == [
+            ("moneyline", 0.0, "no arbitrage"),
+            ("points_total", 0.0, "no arbitrage"),
+        ]
+
+    def test_no_arb_markets_survive_a_model_failure(self):
+        with patch.object(gps, "_get_model_service", side_effect=RuntimeError("no model")):
+            markets = score(self.BOUNDARY_ODDS)
+        assert [(m["market_type"], m["prediction"]) for m in markets] == [
+            ("moneyline", "no arbitrage"),
+        ]
@@ -6,19 +6,22 @@ Covers:
   - NBA parser: STATUS_SCHEDULED only; seasontype=2 param sent to ESPN
   - MLB parser: Preview state only; gameType=R sent to MLB API
   - NFL parser: STATUS_SCHEDULED only; seasontype=2 param sent to ESPN
-  - NHL parser: FUT + gameType==2 only; week-by-week pagination
+  - NHL parser: FUT + gameType==2 only; one request per week in the window
   - Team name normalization for all four leagues
   - games_service aggregator: concurrent fetch + sort
   - games_service retry logic: failures isolated per league
   - API endpoints: GET / , GET /api/v1/health , GET /api/v1/games
 """
 
+import json
+
 import pytest
 import pytest_asyncio
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock, call
 from fastapi.testclient import TestClient
 
+from app.config import settings
 from app.main import app
 from app.models.game import Game
 from app.services.nba_service import fetch_upcoming_nba_games, _normalize as nba_normalize
@@ -34,8 +37,11 @@ from app.services.games_service import _fetch_with_retry, get_all_upcoming_games
 
 def make_response_mock(json_body: dict) -> MagicMock:
     response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
     response.raise_for_status = MagicMock()
     response.json.return_value = json_body
+    response.content = json.dumps(json_body).encode()
     return response
 
 
@@ -315,8 +321,14 @@ _TEAM_MAP_LOOKUP = {"TOR": "Toronto Maple Leafs", "MTL": "Montreal Canadiens",
                     "BOS": "Boston Bruins", "NYR": "New York Rangers"}
 
 
+@pytest.fixture
+def one_week_window(monkeypatch):
+    """Limit the lookahead so the NHL service requests a single week."""
+    monkeypatch.setattr(settings, "days_ahead", 6)
+
+
 @pytest.mark.asyncio
-async def test_nhl_returns_only_regular_season_future_games():
+async def test_nhl_returns_only_regular_season_future_games(one_week_window):
     """gameType==2 and gameState==FUT games pass; all others are excluded."""
     week1 = _nhl_week(None, [
         _nhl_game(2, "FUT",   "TOR", "MTL", "2026-02-21T00:00:00Z"),   # regular + future → KEEP
@@ -333,8 +345,9 @@ async def test_nhl_returns_only_regular_season_future_games():
 
 
 @pytest.mark.asyncio
-async def test_nhl_paginates_multiple_weeks():
-    """Service should follow nextStartDate and collect games across multiple weeks."""
+async def test_nhl_fetches_every_week_in_window(monkeypatch):
+    """Service should request each week in the window and collect games across them."""
+    monkeypatch.setattr(settings, "days_ahead", 13)
     week1 = _nhl_week("2026-02-28", [
         _nhl_game(2, "FUT", "TOR", "MTL", "2026-02-21T00:00:00Z"),
     ])
@@ -354,8 +367,8 @@ async def test_nhl_paginates_multiple_weeks():
 
 
 @pytest.mark.asyncio
-async def test_nhl_stops_paginating_when_no_next_date():
-    """If nextStartDate is absent, pagination stops after the first page."""
+async def test_nhl_only_requests_weeks_inside_window(one_week_window):
+    """A window shorter than a week needs only the first page."""
     week1 = _nhl_week(None, [
         _nhl_game(2, "FUT", "TOR", "MTL", "2026-02-21T00:00:00Z"),
     ])
@@ -366,7 +379,27 @@ async def test_nhl_stops_paginating_when_no_next_date():
 
 
 @pytest.mark.asyncio
-async def test_nhl_empty_game_week_returns_empty_list():
+async def test_nhl_reuses_cached_page_on_not_modified(one_week_window, monkeypatch):
+    """A 304 for a page fetched earlier reuses the parsed page from that fetch."""
+    monkeypatch.setattr("app.services.nhl_service._page_cache", {})
+    first = make_response_mock(_nhl_week(None, [
+        _nhl_game(2, "FUT", "TOR", "MTL", "2026-02-21T00:00:00Z"),
+    ]))
+    first.headers = {"ETag": '"v1"'}
+    not_modified = MagicMock(status_code=304, headers={})
+
+    client = MagicMock(spec=httpx.AsyncClient)
+    client.get = AsyncMock(side_effect=[first, not_modified])
+
+    assert len(await fetch_upcoming_nhl_games(client)) == 1
+    games = await fetch_upcoming_nhl_games(client)
+    assert len(games) == 1
+    assert games[0].home_team == "Toronto Maple Leafs"
+    assert client.get.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_nhl_empty_game_week_returns_empty_list(one_week_window):
     client = make_client_mock({"gameWeek": []})
     assert await fetch_upcoming_nhl_games(client) == []
 
@@ -389,7 +422,7 @@ async def test_fetch_with_retry_succeeds_on_first_attempt():
 @pytest.mark.asyncio
 async def test_fetch_with_retry_retries_on_failure_then_succeeds():
     good_game = Game(category="hockey", live=0, home_team="X", away_team="Y", start_time="2026-01-01T00:00:00Z")
-    fetcher = AsyncMock(side_effect=[Exception("timeout"), Exception("timeout"), [good_game]])
+    fetcher = AsyncMock(side_effect=[httpx.ConnectTimeout("timeout"), httpx.ConnectTimeout("timeout"), [good_game]])
     client = MagicMock(spec=httpx.AsyncClient)
     with patch("app.services.games_service.asyncio.sleep", new_callable=AsyncMock):
         games = await _fetch_with_retry("TEST", fetcher, client)
@@ -399,12 +432,35 @@ async def test_fetch_with_retry_retries_on_failure_then_succeeds():
 
 @pytest.mark.asyncio
 async def test_fetch_with_retry_returns_empty_after_all_retries_exhausted():
-    fetcher = AsyncMock(side_effect=Exception("always fails"))
+    fetcher = AsyncMock(side_effect=httpx.ConnectError("always fails"))
     client = MagicMock(spec=httpx.AsyncClient)
-    with patch("app.services.games_service.asyncio.sleep", new_callable=AsyncMock):
+    with patch("app.services.games_service.asyncio.sleep", new_callable=AsyncMock) as sleep:
         games = await _fetch_with_retry("TEST", fetcher, client)
     assert games == []
     assert fetcher.await_count == 3
+    assert sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_does_not_retry_permanent_http_errors():
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(404, request=request)
+    fetcher = AsyncMock(side_effect=httpx.HTTPStatusError("not found", request=request, response=response))
+    client = MagicMock(spec=httpx.AsyncClient)
+    with patch("app.services.games_service.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        games = await _fetch_with_retry("TEST", fetcher, client)
+    assert games == []
+    fetcher.assert_awaited_once()
+    sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_does_not_retry_parse_errors():
+    fetcher = AsyncMock(side_effect=KeyError("events"))
+    client = MagicMock(spec=httpx.AsyncClient)
+    games = await _fetch_with_retry("TEST", fetcher, client)
+    assert games == []
+    fetcher.assert_awaited_once()
 
 
 # ---------------------------------------------------------------------------
@@ -535,3 +591,78 @@ class TestGamesEndpoint:
         with patch("app.routers.games.get_all_upcoming_games",
                    new_callable=AsyncMock, side_effect=Exception("upstream failure")):
             assert client.get("/api/v1/games").status_code == 502
+
+
+class TestGameOddsEndpoint:
+    ROWS = [{"game_id": "g1", "market_type": "moneyline", "bookmaker": "DraftKings",
+             "price": -110, "outcome_side": "home", "line_value": None}]
+
+    def _mock_odds(self, rows):
+        return patch(
+            "app.services.delta_lake_service.fetch_odds_for_game",
+            return_value=rows,
+        )
+
+    def test_odds_returns_rows_as_json(self):
+        with self._mock_odds(self.ROWS):
+            resp = client.get("/api/v1/games/g1/odds")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json() == self.ROWS
+
+    def test_odds_body_is_memoized_while_rows_unchanged(self):
+        from app.services import delta_lake_service
+
+        delta_lake_service.invalidate("odds", "g1")
+        with self._mock_odds(self.ROWS):
+            first = delta_lake_service.fetch_odds_bytes("g1")
+            assert delta_lake_service.fetch_odds_bytes("g1") is first
+        with self._mock_odds([dict(self.ROWS[0], price=120)]):
+            assert delta_lake_service.fetch_odds_bytes("g1") != first
+
+    def test_odds_falls_back_to_sample_rows(self):
+        from app.services import delta_lake_service
+
+        delta_lake_service.invalidate("odds", "sample-001")
+        with patch("app.services.delta_lake_service._databricks_available", return_value=False), \
+                patch("app.services.delta_lake_service._cached_odds", None):
+            resp = client.get("/api/v1/games/sample-001/odds")
+            assert resp.status_code == 200
+            assert resp.json() == [dict(r) for r in delta_lake_service.SAMPLE_ODDS["sample-001"]]
+            first = delta_lake_service.fetch_odds_bytes("sample-001")
+            assert delta_lake_service.fetch_odds_bytes("sample-001") is first
+
+    def test_odds_returns_502_on_service_error(self):
+        with patch("app.routers.games.fetch_odds_bytes", side_effect=Exception("upstream failure")):
+            assert client.get("/api/v1/games/g1/odds").status_code == 502
+
+
+class TestDeltaLakeCache:
+    def test_category_query_binds_the_normalized_cache_key(self):
+        import asyncio
+        from app.services import delta_lake_service
+
+        delta_lake_service.invalidate("games")
+        query = AsyncMock(return_value=[{"game_id": "g1", "category": "basketball"}])
+        with patch.object(delta_lake_service, "_databricks_available", return_value=True), \
+                patch.object(delta_lake_service, "_execute_with_retry_async", query), \
+                patch.object(settings, "odds_prefetch_count", 0):
+            asyncio.run(delta_lake_service.fetch_upcoming_games_async("Basketball"))
+            asyncio.run(delta_lake_service.fetch_upcoming_games_async("basketball"))
+        query.assert_awaited_once()
+        sql, params = query.await_args.args
+        assert "lower(category) = :category" in sql
+        assert params == {"category": "basketball"}
+        delta_lake_service.invalidate("games")
+
+    def test_put_sweeps_expired_entries(self):
+        import time
+        from app.services import delta_lake_service as dls
+
+        version = dls._cache_version
+        dls._odds_entries["gone"] = dls.CacheEntry([], time.monotonic() - 1, version)
+        with patch.object(dls, "_next_sweep_at", 0.0):
+            dls._cache_put(dls._odds_entries, "live", [], 30.0, version)
+        assert "gone" not in dls._odds_entries
+        assert "live" in dls._odds_entries
+        dls.invalidate("odds")
@@ -0,0 +1,91 @@
+"""
+Tests for ml_service's whole-slate prediction cache.
+
+The pipeline itself (_fetch_all_predictions_sync) is replaced with a stub
+that counts its runs.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services import ml_service
+
+PAYLOAD = {
+    "category": "basketball",
+    "date": "2026-01-01T00:00:00Z",
+    "home_team": "A",
+    "away_team": "B",
+    "markets": [{"market_type": "moneyline", "confidence": 0.7}],
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    ml_service.invalidate_predictions()
+    with patch.dict(ml_service._predictions_stats, {"hits": 0, "misses": 0, "shared": 0}), \
+            patch.object(settings, "ml_cache_ttl_seconds", 60.0):
+        yield
+    ml_service.invalidate_predictions()
+
+
+def stub_pipeline(result, delay: float = 0.0):
+    calls = []
+
+    def run():
+        calls.append(1)
+        time.sleep(delay)
+        return [dict(p, markets=list(p["markets"])) for p in result]
+
+    return patch.object(ml_service, "_fetch_all_predictions_sync", run), calls
+
+
+class TestPredictionCache:
+    def test_repeat_call_within_ttl_hits_the_cache(self):
+        patcher, calls = stub_pipeline([PAYLOAD])
+        with patcher:
+            first = asyncio.run(ml_service.fetch_all_predictions())
+            second = asyncio.run(ml_service.fetch_all_predictions())
+        assert first == second == [PAYLOAD]
+        assert len(calls) == 1
+        assert ml_service.cache_stats() == {"hits": 1, "misses": 1, "shared": 0}
+
+    def test_callers_get_independent_copies(self):
+        patcher, _ = stub_pipeline([PAYLOAD])
+        with patcher:
+            first = asyncio.run(ml_service.fetch_all_predictions())
+            first[0]["markets"][0]["confidence"] = 0.0
+            first.append({})
+            second = asyncio.run(ml_service.fetch_all_predictions())
+        assert second == [PAYLOAD]
+
+    def test_zero_ttl_disables_the_cache(self):
+        patcher, calls = stub_pipeline([PAYLOAD])
+        with patcher, patch.object(settings, "ml_cache_ttl_seconds", 0.0):
+            asyncio.run(ml_service.fetch_all_predictions())
+            asyncio.run(ml_service.fetch_all_predictions())
+        assert len(calls) == 2
+
+    def test_concurrent_callers_share_one_run(self):
+        patcher, calls = stub_pipeline([PAYLOAD], delay=0.05)
+
+        async def three_calls():
+            return await asyncio.gather(*(ml_service.fetch_all_predictions() for _ in range(3)))
+
+        with patcher:
+            results = asyncio.run(three_calls())
+        assert results == [[PAYLOAD]] * 3
+        assert len(calls) == 1
+        assert ml_service.cache_stats() == {"hits": 0, "misses": 1, "shared": 2}
+
+    def test_sample_fallback_is_not_cached(self):
+        patcher, calls = stub_pipeline([])
+        with patcher:
+            first = asyncio.run(ml_service.fetch_all_predictions())
+            second = asyncio.run(ml_service.fetch_all_predictions())
+        assert first == second == [ml_service.SAMPLE_PAYLOAD]
+        assert len(calls) == 2
+        assert ml_service.cache_stats()["hits"] == 0
@@ -0,0 +1,173 @@
+"""
+Tests for prediction_service: Databricks serving retries, the circuit
+breaker in front of them, and the recent-request score cache.
+
+The serving client is a stub, so nothing here reaches Databricks.
+"""
+
+import threading
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+import pytest
+from databricks.sdk.errors import TooManyRequests
+
+from app.config import settings
+from app.models.prediction import PredictionRequest
+from app.services import prediction_service as ps
+
+OK = {"predictions": [0.5]}
+
+
+class StubClient:
+    """Serving client that raises the queued errors, then returns OK."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def query(self, records):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return OK
+
+
+@pytest.fixture
+def breaker():
+    fresh = ps._CircuitBreaker(threshold=5, reset_seconds=30.0)
+    with patch.object(ps, "_serving_breaker", fresh), \
+            patch.object(ps, "_serving_retry_delay", return_value=0.0):
+        yield fresh
+
+
+def query(client) -> dict:
+    return ps.DatabricksModelService(client)._query([{}])
+
+
+def transient() -> list[Exception]:
+    return [TooManyRequests("429")] * ps._SERVING_ATTEMPTS
+
+
+class TestServingRetries:
+    def test_transient_errors_are_retried(self, breaker):
+        client = StubClient(TooManyRequests("429"), TimeoutError())
+        assert query(client) == OK
+        assert client.calls == 3
+        assert breaker._failures == 0
+
+    def test_exhausted_retries_count_one_failure(self, breaker):
+        client = StubClient(*transient())
+        with pytest.raises(TooManyRequests):
+            query(client)
+        assert client.calls == ps._SERVING_ATTEMPTS
+        assert breaker._failures == 1
+
+    def test_non_transient_error_raises_at_once(self, breaker):
+        client = StubClient(ValueError("bad payload"))
+        with pytest.raises(ValueError):
+            query(client)
+        assert client.calls == 1
+        assert breaker._failures == 0
+
+
+class TestCircuitBreaker:
+    def trip(self) -> None:
+        for _ in range(5):
+            with pytest.raises(TooManyRequests):
+                query(StubClient(*transient()))
+
+    def test_opens_after_five_failed_queries(self, breaker):
+        self.trip()
+        client = StubClient()
+        with pytest.raises(RuntimeError, match="circuit open"):
+            query(client)
+        assert client.calls == 0
+
+    def test_half_open_lets_a_single_probe_through(self, breaker):
+        self.trip()
+        breaker._open_until = 0.0  # reset period over
+        started, release = threading.Event(), threading.Event()
+
+        class SlowClient(StubClient):
+            def query(self, records):
+                started.set()
+                release.wait(5)
+                return super().query(records)
+
+        probe_client = SlowClient()
+        probe = threading.Thread(target=query, args=(probe_client,))
+        probe.start()
+        assert started.wait(5)
+
+        other = StubClient()
+        with pytest.raises(RuntimeError, match="circuit open"):
+            query(other)
+        assert other.calls == 0
+
+        release.set()
+        probe.join(5)
+        assert probe_client.calls == 1
+        # The probe succeeded, so the breaker is closed again
+        assert query(other) == OK
+
+    def test_failed_probe_reopens_the_breaker(self, breaker):
+        self.trip()
+        breaker._open_until = 0.0
+        with pytest.raises(TooManyRequests):
+            query(StubClient(*transient()))
+        with pytest.raises(RuntimeError, match="circuit open"):
+            query(StubClient())
+
+
+def request(value: float = -3.5, odds: dict | None = None) -> PredictionRequest:
+    return PredictionRequest(
+        category="basketball", date="2026-01-01T00:00:00Z", live=0,
+        home_team="A", away_team="B", value=value,
+        current_odds=odds or {"DraftKings": [1.91, 1.95], "FanDuel": [2.05, 1.87]},
+    )
+
+
+@pytest.fixture
+def model():
+    service = MagicMock()
+    service.predict_markets_from_request.side_effect = (
+        lambda req, market_types: [{"market_type": mt} for mt in market_types])
+    with patch.object(ps, "_get_model_service", return_value=service), \
+            patch.object(ps, "_score_cache", OrderedDict()), \
+            patch.object(settings, "prediction_cache_ttl_seconds", 30.0):
+        yield service.predict_markets_from_request
+
+
+class TestScoreCache:
+    def test_repeated_request_hits_the_cache(self, model):
+        first = ps._score_markets(request(), ["MONEYLINE"])
+        assert ps._score_markets(request(), ["MONEYLINE"]) == first
+        assert model.call_count == 1
+
+    def test_bookmaker_order_changes_the_key(self, model):
+        swapped = {"FanDuel": [2.05, 1.87], "DraftKings": [1.91, 1.95]}
+        assert ps._request_key(request(), ["MONEYLINE"]) != ps._request_key(
+            request(odds=swapped), ["MONEYLINE"])
+        ps._score_markets(request(), ["MONEYLINE"])
+        ps._score_markets(request(odds=swapped), ["MONEYLINE"])
+        assert model.call_count == 2
+
+    def test_zero_ttl_disables_the_cache(self, model):
+        with patch.object(settings, "prediction_cache_ttl_seconds", 0):
+            ps._score_markets(request(), ["MONEYLINE"])
+            ps._score_markets(request(), ["MONEYLINE"])
+        assert model.call_count == 2
+        assert len(ps._score_cache) == 0
+
+    def test_evicts_least_recently_used_past_1024_entries(self, model):
+        assert ps._SCORE_CACHE_SIZE == 1024
+        for i in range(1024):
+            ps._score_markets(request(value=i), ["MONEYLINE"])
+        ps._score_markets(request(value=0), ["MONEYLINE"])  # refresh entry 0
+        ps._score_markets(request(value=1024), ["MONEYLINE"])
+
+        assert len(ps._score_cache) == 1024
+        assert ps._request_key(request(value=0), ["MONEYLINE"]) in ps._score_cache
+        assert ps._request_key(request(value=1), ["MONEYLINE"]) not in ps._score_cache
+        assert model.call_count == 1025